@@ -0,0 +1,135 @@
+# backend/benchmarks/bench_inference.py
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.benchmarks.bench_pipeline import _summarize, _check_environment
+
+# The fast path's single-row latency budget
+P99_TARGET_MS = 1.0
+# Largest accepted probability difference between the fast path and make_prediction
+PARITY_TOLERANCE = 1e-6
+
+def train_benchmark_model(rows: int = 20_000, num_rounds: int = 300, seed: int = 0) -> str:
+    """
+    Trains a model of production size on random features and promotes it in the configured MODELS_DIR.
+
+    Returns:
+        str: The saved model version.
+    """
+    import xgboost as xgb
+    from backend.ml_models.feature_schema import MODEL_FEATURES, build_manifest
+    from backend.ml_models.model_registry import save_artifact
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, len(MODEL_FEATURES))).astype(np.float32)
+    y = (X[:, 0] + X[:, 2] * X[:, 4] + rng.normal(0, 1, rows) > 0).astype(np.float32)
+    dtrain = xgb.DMatrix(X, label=y, feature_names=MODEL_FEATURES)
+    booster = xgb.train({'objective': 'binary:logistic', 'tree_method': 'hist', 'max_depth': 6}, dtrain, num_rounds)
+    return save_artifact(booster, build_manifest(), metrics={}, data_hash=f"random-{seed}-{rows}")
+
+def make_feature_rows(count: int, seed: int = 1) -> list:
+    """
+    Builds one-row frames shaped like feature_store.get_latest output: the model features plus other master columns.
+    """
+    from backend.ml_models.feature_schema import MODEL_FEATURES
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(count):
+        row = {'date': pd.Timestamp("2024-12-31"), 'close': 100.0, 'volume': 1_000_000, 'target': 0}
+        row.update(dict(zip(MODEL_FEATURES, rng.normal(size=len(MODEL_FEATURES)))))
+        rows.append(pd.DataFrame([row]))
+    return rows
+
+def check_parity(rows: list) -> float:
+    """
+    Scores every row with make_prediction and with make_fast_prediction.
+
+    Returns:
+        float: The largest absolute confidence difference.
+
+    Raises:
+        AssertionError: If a label or confidence differs beyond PARITY_TOLERANCE.
+    """
+    from backend.ml_models.predict import make_prediction
+    from backend.ml_models.fast_inference import make_fast_prediction
+
+    max_difference = 0.0
+    for row in rows:
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = make_prediction(row)
+        actual = make_fast_prediction(row)
+        difference = abs(expected['confidence'] - actual['confidence'])
+        assert difference <= PARITY_TOLERANCE, f"Confidence differs by {difference:.2e} on row {row.to_dict('records')}"
+        assert expected['prediction'] == actual['prediction'] and expected['model_version'] == actual['model_version']
+        max_difference = max(max_difference, difference)
+    return max_difference
+
+def run_inference_benchmark(calls: int = 2000, parity_rows: int = 500, seed: int = 0) -> dict:
+    """
+    Checks the fast path against make_prediction, then times single-row scoring on each path.
+
+    Returns:
+        dict: {'max_difference': ..., 'paths': {path: {calls, total_s, p50_ms, p95_ms, p99_ms}}}
+    """
+    _check_environment()
+    from backend.ml_models.predict import make_prediction
+    from backend.ml_models.fast_inference import make_fast_prediction, predict_proba_fast
+    from backend.ml_models.feature_schema import MODEL_FEATURES
+
+    train_benchmark_model(seed=seed)
+    rows = make_feature_rows(max(calls, parity_rows), seed=seed + 1)
+    max_difference = check_parity(rows[:parity_rows])
+    row_dicts = [{feature: row[feature].iat[0] for feature in MODEL_FEATURES} for row in rows]
+
+    def time_calls(function, inputs) -> list:
+        timings = []
+        for item in inputs[:calls]:
+            start = time.perf_counter()
+            function(item)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    paths = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        paths['make_prediction'] = _summarize(time_calls(make_prediction, rows))
+    paths['make_fast_prediction'] = _summarize(time_calls(make_fast_prediction, rows))
+    paths['predict_proba_fast (dict)'] = _summarize(time_calls(predict_proba_fast, row_dicts))
+    return {'max_difference': max_difference, 'paths': paths}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Parity check and latency benchmark of single-row inference.")
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--parity-rows', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # The benchmark model is saved and promoted in a scratch directory, never over the real one
+    scratch_dir = Path(tempfile.mkdtemp(prefix="stock_bench_inference_"))
+    os.environ.setdefault("DATA_DIR", str(scratch_dir / "data"))
+    os.environ.setdefault("MODELS_DIR", str(scratch_dir / "models"))
+    os.environ.setdefault("INSTRUMENTATION_ENABLED", "0")
+
+    result = run_inference_benchmark(args.calls, args.parity_rows, args.seed)
+
+    print(f"\n✅ Parity with make_prediction on {args.parity_rows} rows (max difference {result['max_difference']:.2e})")
+    print("--- Single-row inference latency ---")
+    for path_name, stats in result['paths'].items():
+        print(f"{path_name:<28} {stats['calls']:>6} calls  p50 {stats['p50_ms']:>8.3f} ms  "
+              f"p95 {stats['p95_ms']:>8.3f} ms  p99 {stats['p99_ms']:>8.3f} ms")
+
+    fast_p99 = result['paths']['make_fast_prediction']['p99_ms']
+    if fast_p99 > P99_TARGET_MS:
+        print(f"❌ Fast path p99 {fast_p99:.3f} ms is over the {P99_TARGET_MS} ms target.")
+        sys.exit(1)
+    print(f"✅ Fast path p99 {fast_p99:.3f} ms is within the {P99_TARGET_MS} ms target.")
@@ -0,0 +1,189 @@
+# backend/benchmarks/bench_pipeline.py
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(PROJECT_ROOT))
+
+BASELINE_PATH = Path(__file__).resolve().parent / "pipeline_baseline.json"
+
+# A stage is flagged when its median latency is this much slower than the baseline
+REGRESSION_TOLERANCE = 0.25
+
+def _summarize(seconds: list, rows: int = None) -> dict:
+    """
+    Turns per-call timings into latency percentiles and throughput.
+    """
+    seconds = np.asarray(seconds)
+    summary = {
+        'calls': int(len(seconds)),
+        'total_s': float(seconds.sum()),
+        'p50_ms': float(np.percentile(seconds, 50) * 1000),
+        'p95_ms': float(np.percentile(seconds, 95) * 1000),
+        'p99_ms': float(np.percentile(seconds, 99) * 1000),
+    }
+    if rows is not None:
+        summary['rows'] = int(rows)
+        summary['rows_per_s'] = rows / max(summary['total_s'], 1e-9)
+    return summary
+
+def _timed(function, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+def _check_environment():
+    """
+    Refuses to run unless DATA_DIR and MODELS_DIR point away from the real data and model.
+    """
+    from backend.config import settings
+    if settings.DATA_DIR == PROJECT_ROOT / "data" or settings.MODELS_DIR == PROJECT_ROOT / "backend/saved_models":
+        raise RuntimeError("Set DATA_DIR and MODELS_DIR to a scratch directory before running the benchmark "
+                           "(python backend/benchmarks/bench_pipeline.py does this for you).")
+
+def run_pipeline_benchmark(tickers: int = 10, years: int = 3, seed: int = 0, latency_calls: int = 200) -> dict:
+    """
+    Generates a synthetic universe and times every pipeline stage on it, fully offline.
+
+    Args:
+        tickers (int): Number of synthetic tickers.
+        years (int): Years of daily history per ticker.
+        seed (int): Seed of the synthetic data.
+        latency_calls (int): Repeated single-row calls used for the prediction latency percentiles.
+
+    Returns:
+        dict: {'config': ..., 'stages': {stage: {calls, total_s, p50_ms, p95_ms, p99_ms[, rows, rows_per_s]}}}
+    """
+    _check_environment()
+    from backend.benchmarks.synthetic_data import write_synthetic_universe
+    from backend.config.settings import RAW_DATA_DIR, PROCESSED_DATA_DIR
+    from backend.utils.storage import dataset_path, read_frame
+    from backend.utils import feature_store
+    from backend.feature_engineering.build_fundamental_features import build_fundamental_features
+    from backend.feature_engineering.build_technical_features import build_technical_features
+    from backend.feature_engineering.build_sentiment_features import analyze_sentiment
+    from backend.feature_engineering.unify_features import unify_features, unify_features_panel
+    from backend.ml_models.train_model import train_model
+    from backend.ml_models.train_panel import train_panel_model
+    from backend.ml_models.predict import make_prediction
+    from backend.ml_models.explain import explain_prediction, clear_explanation_cache
+
+    def rows_of(prefix: str, of_tickers: list = None) -> int:
+        return sum(len(read_frame(dataset_path(PROCESSED_DATA_DIR, f"{prefix}_{ticker}"), columns=['date']))
+                   for ticker in of_tickers or names)
+
+    stages = {}
+    start = time.perf_counter()
+    names = write_synthetic_universe(tickers=tickers, years=years, seed=seed)
+    stages['generate_synthetic_data'] = _summarize([time.perf_counter() - start])
+
+    timings = [_timed(build_fundamental_features, ticker) for ticker in names]
+    stages['build_fundamental_features'] = _summarize(timings)
+
+    timings = [_timed(build_technical_features, ticker, incremental=False) for ticker in names]
+    stages['build_technical_features'] = _summarize(timings, rows_of("technical_features"))
+
+    # Every headline is already in the sentiment cache, so this measures the offline (cached) path
+    timings = [_timed(analyze_sentiment, dataset_path(RAW_DATA_DIR, f"news_{ticker}"),
+                      dataset_path(PROCESSED_DATA_DIR, f"sentiment_features_{ticker}")) for ticker in names]
+    stages['analyze_sentiment_cached'] = _summarize(timings)
+
+    timings = [_timed(unify_features, ticker, incremental=False) for ticker in names]
+    stages['unify_features'] = _summarize(timings, rows_of("master_dataset"))
+    stages['unify_features_panel'] = _summarize([_timed(unify_features_panel, names)], rows_of("master_dataset"))
+
+    stages['train_model'] = _summarize([_timed(train_model, names[0])], rows_of("master_dataset", names[:1]))
+    stages['train_panel_model'] = _summarize([_timed(train_panel_model, names)], rows_of("master_dataset"))
+
+    latest_row = feature_store.get_latest(names[0])
+    make_prediction(latest_row)  # load the model outside the timed calls
+    stages['make_prediction'] = _summarize([_timed(make_prediction, latest_row) for _ in range(latency_calls)])
+    def explain_uncached():
+        clear_explanation_cache()
+        explain_prediction(latest_row, ticker=names[0])
+
+    explain_uncached()
+    stages['explain_prediction'] = _summarize([_timed(explain_uncached) for _ in range(latency_calls)])
+    stages['explain_prediction_cached'] = _summarize(
+        [_timed(explain_prediction, latest_row, ticker=names[0]) for _ in range(latency_calls)]
+    )
+
+    return {'config': {'tickers': tickers, 'years': years, 'seed': seed}, 'stages': stages}
+
+def _baseline_key(config: dict) -> str:
+    return f"tickers={config['tickers']},years={config['years']},seed={config['seed']}"
+
+def compare_with_baseline(result: dict, tolerance: float = REGRESSION_TOLERANCE, baseline_path: Path = BASELINE_PATH) -> list:
+    """
+    Compares median latencies with the stored baseline for the same configuration.
+
+    Returns:
+        list: (stage, baseline p50 ms, current p50 ms) for every stage slower than the tolerance allows.
+    """
+    if not baseline_path.exists():
+        return []
+    with open(baseline_path) as f:
+        baseline = json.load(f).get(_baseline_key(result['config']), {})
+
+    regressions = []
+    for stage_name, current in result['stages'].items():
+        previous = baseline.get(stage_name)
+        if previous and current['p50_ms'] > previous['p50_ms'] * (1 + tolerance):
+            regressions.append((stage_name, previous['p50_ms'], current['p50_ms']))
+    return regressions
+
+def save_baseline(result: dict, baseline_path: Path = BASELINE_PATH):
+    """
+    Stores a result as the baseline for its configuration, keeping other configurations.
+    """
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    baseline[_baseline_key(result['config'])] = result['stages']
+    with open(baseline_path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic data.")
+    parser.add_argument('--tickers', type=int, default=10)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-calls', type=int, default=200)
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline.")
+    args = parser.parse_args()
+
+    # Everything (data, caches, the trained model) goes to a scratch directory.
+    # Must happen before any backend module reads the settings.
+    scratch_dir = Path(tempfile.mkdtemp(prefix="stock_bench_"))
+    os.environ.setdefault("DATA_DIR", str(scratch_dir / "data"))
+    os.environ.setdefault("MODELS_DIR", str(scratch_dir / "models"))
+    # Keep the stage log out of the timings
+    os.environ.setdefault("INSTRUMENTATION_ENABLED", "0")
+
+    result = run_pipeline_benchmark(args.tickers, args.years, args.seed, args.latency_calls)
+
+    print(f"\n--- Pipeline benchmark ({_baseline_key(result['config'])}) ---")
+    for stage_name, stats in result['stages'].items():
+        throughput = f"{stats['rows_per_s']:>12,.0f} rows/s" if 'rows_per_s' in stats else ""
+        print(f"{stage_name:<28} {stats['calls']:>5} calls  p50 {stats['p50_ms']:>10.2f} ms  "
+              f"p95 {stats['p95_ms']:>10.2f} ms  {throughput}")
+
+    if args.save_baseline:
+        save_baseline(result)
+        print(f"✅ Saved baseline to {BASELINE_PATH}")
+    else:
+        regressions = compare_with_baseline(result, args.tolerance)
+        for stage_name, previous, current in regressions:
+            print(f"❌ Regression in {stage_name}: p50 {previous:.2f} ms -> {current:.2f} ms")
+        if not regressions:
+            print("✅ No regressions against the baseline." if BASELINE_PATH.exists() else "⚠️ No baseline stored yet.")
+        sys.exit(1 if regressions else 0)
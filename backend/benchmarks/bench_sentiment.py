@@ -0,0 +1,148 @@
+# backend/benchmarks/bench_sentiment.py
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import SENTIMENT_MODEL_ID
+
+_COMPANIES = ["Apple", "Microsoft", "Alphabet", "Amazon", "Nvidia", "Tesla", "Meta", "Netflix"]
+_EVENTS = [
+    "beats quarterly earnings estimates", "misses revenue expectations", "announces share buyback",
+    "faces antitrust probe", "cuts full-year guidance", "unveils new product line",
+    "shares slide after analyst downgrade", "expands into new markets", "reports record cash flow",
+    "CEO steps down amid restructuring"
+]
+_SUFFIXES = ["", " as investors weigh outlook", " ahead of Fed decision", " in volatile session",
+             ", sending stock to multi-year high", " despite supply chain headwinds"]
+
+def make_headlines(count: int, seed: int = 42) -> list:
+    """
+    Generates deterministic synthetic financial headlines of varied length.
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        f"{rng.choice(_COMPANIES)} {rng.choice(_EVENTS)}{rng.choice(_SUFFIXES)} ({i})"
+        for i in range(count)
+    ]
+
+def _baseline_pipeline_run(titles: list):
+    """
+    The original analyze_sentiment path: build the pipeline inside the call, then score every title.
+    """
+    import torch
+    from transformers import pipeline
+    device = 0 if torch.cuda.is_available() else -1
+    sentiment_pipeline = pipeline("sentiment-analysis", model=SENTIMENT_MODEL_ID, device=device)
+    return sentiment_pipeline(titles)
+
+def benchmark_sentiment(articles: int = 500, calls: int = 3) -> dict:
+    """
+    Compares articles/sec of the per-call pipeline against the shared, batched engine.
+
+    Each of `calls` calls scores `articles` headlines, like one ticker per pipeline run.
+    """
+    from backend.feature_engineering.sentiment_engine import get_sentiment_engine, score_titles
+
+    titles = make_headlines(articles)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        _baseline_pipeline_run(titles)
+    baseline_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get_sentiment_engine()
+    engine_load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        score_titles(titles)
+    engine_seconds = time.perf_counter() - start
+
+    total_articles = articles * calls
+    report = {
+        'articles': total_articles,
+        'baseline_articles_per_s': total_articles / baseline_seconds,
+        'engine_articles_per_s': total_articles / engine_seconds,
+        'engine_articles_per_s_incl_load': total_articles / (engine_seconds + engine_load_seconds),
+        'engine_load_s': engine_load_seconds,
+    }
+    report['speedup'] = report['engine_articles_per_s_incl_load'] / report['baseline_articles_per_s']
+    return report
+
+_LABEL_SIGN = {'positive': 1, 'negative': -1, 'neutral': 0}
+
+def check_backend_parity(backend: str, reference: str = 'torch', articles: int = 500,
+                         min_label_agreement: float = 0.98, numeric_tolerance: float = 0.05) -> dict:
+    """
+    Compares an alternative inference backend with the reference one on the same headlines.
+
+    Checks that labels agree on at least `min_label_agreement` of the headlines and that the
+    signed `sentiment_numeric` value stays within `numeric_tolerance` where labels agree.
+
+    Raises:
+        AssertionError: If either check fails.
+    """
+    from backend.feature_engineering.sentiment_engine import score_titles
+
+    titles = make_headlines(articles)
+    expected = score_titles(titles, backend=reference)
+    actual = score_titles(titles, backend=backend)
+
+    agreeing = [(e, a) for e, a in zip(expected, actual) if e['label'] == a['label']]
+    numeric_diffs = [
+        abs(_LABEL_SIGN[e['label']] * e['score'] - _LABEL_SIGN[a['label']] * a['score']) for e, a in agreeing
+    ]
+    report = {
+        'label_agreement': len(agreeing) / len(titles),
+        'max_numeric_diff': max(numeric_diffs, default=0.0),
+        'mean_numeric_diff': float(np.mean(numeric_diffs)) if numeric_diffs else 0.0,
+    }
+    assert report['label_agreement'] >= min_label_agreement, \
+        f"{backend}: label agreement {report['label_agreement']:.2%} is below {min_label_agreement:.2%}"
+    assert report['max_numeric_diff'] <= numeric_tolerance, \
+        f"{backend}: sentiment_numeric differs by {report['max_numeric_diff']:.4f} (> {numeric_tolerance})"
+    return report
+
+def benchmark_backends(articles: int = 500, repeats: int = 3) -> dict:
+    """
+    Measures throughput and per-batch latency of every sentiment backend on the same headlines.
+    """
+    from backend.config.settings import SENTIMENT_BATCH_SIZE
+    from backend.feature_engineering.sentiment_engine import SENTIMENT_BACKENDS, get_sentiment_engine, score_titles
+
+    titles = make_headlines(articles)
+    report = {}
+    for backend in SENTIMENT_BACKENDS:
+        get_sentiment_engine(backend)
+        score_titles(titles[:SENTIMENT_BATCH_SIZE], backend=backend)  # warm-up
+
+        batch_latencies = []
+        for _ in range(repeats):
+            for start in range(0, articles, SENTIMENT_BATCH_SIZE):
+                batch_start = time.perf_counter()
+                score_titles(titles[start:start + SENTIMENT_BATCH_SIZE], backend=backend)
+                batch_latencies.append(time.perf_counter() - batch_start)
+
+        report[backend] = {
+            'articles_per_s': articles * repeats / sum(batch_latencies),
+            'batch_latency_p50_ms': float(np.percentile(batch_latencies, 50) * 1000),
+            'batch_latency_p95_ms': float(np.percentile(batch_latencies, 95) * 1000),
+        }
+    return report
+
+if __name__ == '__main__':
+    print("Benchmarking FinBERT sentiment scoring...")
+    for name, value in benchmark_sentiment().items():
+        print(f"  {name}: {value:,.2f}")
+
+    print("\nBenchmarking sentiment backends...")
+    for backend, metrics in benchmark_backends().items():
+        print(f"  {backend}: " + ", ".join(f"{name}={value:,.1f}" for name, value in metrics.items()))
+
+    print("\nChecking backend parity against torch fp32...")
+    for backend in ('torch_int8', 'onnx', 'onnx_int8'):
+        print(f"  {backend}: {check_backend_parity(backend)}")
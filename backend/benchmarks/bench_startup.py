@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_startup.py
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FRONTEND_DIR = PROJECT_ROOT / "frontend"
+
+# Cold-start budgets in seconds (fresh interpreter, warm OS file cache).
+# The Analysis page entry covers everything it imports before its first render,
+# except streamlit itself, which every page pays regardless.
+STARTUP_TARGETS = {
+    'backend.main_handler': 1.5,
+    'backend.main_pipeline': 1.5,
+    'analysis_page': 2.0,
+}
+
+# The modules imported by frontend/pages/1_📈_Analysis.py
+_ANALYSIS_PAGE_IMPORTS = (
+    "import backend.main_handler, backend.utils.job_queue, backend.trading_logic.generate_recommendation, "
+    "ui_components.display_info, ui_components.dashboard_plots"
+)
+
+# The packages we deliberately keep out of the startup path
+HEAVY_PACKAGES = ('torch', 'transformers', 'shap', 'xgboost', 'sklearn', 'pandas_ta',
+                  'yfinance', 'newsapi', 'fredapi', 'matplotlib', 'onnxruntime')
+
+def _import_statement(target: str) -> str:
+    return _ANALYSIS_PAGE_IMPORTS if target == 'analysis_page' else f"import {target}"
+
+def measure_import(target: str) -> dict:
+    """
+    Imports a target in a fresh interpreter with `-X importtime` and parses the per-module costs.
+
+    Returns:
+        dict: Total wall time, import time per top-level package (its own modules plus their
+              submodules, wherever in the import tree they were loaded), and which of the
+              HEAVY_PACKAGES were loaded.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(PROJECT_ROOT), str(FRONTEND_DIR), env.get('PYTHONPATH', '')])
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _import_statement(target)],
+        capture_output=True, text=True, env=env, cwd=PROJECT_ROOT
+    )
+    wall_seconds = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{completed.stderr[-2000:]}")
+
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    package_seconds = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        # Every module, at any nesting depth, is charged to its top-level package. Self times
+        # are summed, since cumulative times of nested entries overlap their parents'.
+        package = name.strip().split('.')[0]
+        package_seconds[package] = package_seconds.get(package, 0.0) + int(self_us) / 1e6
+
+    return {
+        'target': target,
+        'wall_s': wall_seconds,
+        'packages': dict(sorted(package_seconds.items(), key=lambda item: item[1], reverse=True)),
+        'heavy_packages_loaded': [package for package in HEAVY_PACKAGES if package in package_seconds],
+    }
+
+def check_startup_targets(repeats: int = 3) -> dict:
+    """
+    Measures every target (best of `repeats` cold starts) and compares it with its budget.
+    """
+    report = {}
+    for target, budget in STARTUP_TARGETS.items():
+        runs = [measure_import(target) for _ in range(repeats)]
+        best = min(runs, key=lambda run: run['wall_s'])
+        best['budget_s'] = budget
+        best['within_budget'] = best['wall_s'] <= budget
+        report[target] = best
+    return report
+
+if __name__ == '__main__':
+    print("Measuring cold-start import cost...")
+    for target, result in check_startup_targets().items():
+        status = "✅" if result['within_budget'] else "❌"
+        print(f"\n{status} {target}: {result['wall_s']:.2f}s (budget {result['budget_s']:.2f}s)")
+        for package, seconds in list(result['packages'].items())[:10]:
+            print(f"    {package:<24} {seconds * 1000:8.1f} ms")
+        if result['heavy_packages_loaded']:
+            print(f"    ⚠️ Heavy packages loaded at startup: {', '.join(result['heavy_packages_loaded'])}")
@@ -0,0 +1,64 @@
+# backend/benchmarks/bench_storage.py
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.utils.storage import BACKENDS, dataset_path, read_frame, write_frame
+
+def make_master_like_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Builds a synthetic frame shaped like a master dataset (one date column plus float features).
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'date': pd.bdate_range('2000-01-03', periods=rows)})
+    for column in ['open', 'high', 'low', 'close', 'volume', 'RSI_14', 'MACD_12_26_9', 'MACDh_12_26_9',
+                   'MACDs_12_26_9', 'rolling_high_52wk', 'rolling_low_52wk', 'avg_sentiment',
+                   'treasury_yield_10y', 'cpi', 'roe', 'roa']:
+        df[column] = rng.normal(size=rows)
+    df['target'] = rng.integers(0, 2, size=rows)
+    return df
+
+def _time(function, repeats: int) -> float:
+    """
+    Returns the best wall time in seconds over a few repeats.
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_storage(rows: int = 250_000, repeats: int = 3) -> pd.DataFrame:
+    """
+    Compares every storage backend on write, full read, column projection, latest-row lookup and file size.
+    """
+    df = make_master_like_frame(rows)
+    latest_date = df['date'].max()
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend in BACKENDS:
+            path = dataset_path(Path(tmp_dir), "master_dataset_BENCH", backend=backend)
+            results.append({
+                'backend': backend,
+                'write_s': _time(lambda: write_frame(df, path), repeats),
+                'read_all_s': _time(lambda: read_frame(path), repeats),
+                'read_2_columns_s': _time(lambda: read_frame(path, columns=['date', 'close']), repeats),
+                'read_latest_row_s': _time(lambda: read_frame(path, filters=[('date', '==', latest_date)]), repeats),
+                'size_mb': path.stat().st_size / 1e6
+            })
+
+    report = pd.DataFrame(results).set_index('backend')
+    csv_read = report.loc['csv', 'read_all_s']
+    report['read_speedup_vs_csv'] = csv_read / report['read_all_s']
+    return report
+
+if __name__ == '__main__':
+    print("Benchmarking storage backends...")
+    print(benchmark_storage().round(4).to_string())
@@ -0,0 +1,115 @@
+# backend/benchmarks/synthetic_data.py
+import hashlib
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import RAW_DATA_DIR
+from backend.utils.storage import dataset_path, write_frame
+from backend.benchmarks.bench_sentiment import make_headlines
+
+# Fixed so the same scale and seed always produce the same data
+END_DATE = pd.Timestamp("2024-12-31")
+
+def _rng(seed: int, ticker: str, kind: str) -> np.random.Generator:
+    # Seeded per ticker and dataset, so adding tickers doesn't change the existing ones
+    return np.random.default_rng([seed] + [ord(c) for c in f"{ticker}:{kind}"])
+
+def ticker_names(count: int) -> list:
+    return [f"SYN{i:04d}" for i in range(count)]
+
+def generate_prices(ticker: str, years: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generates daily OHLCV bars (geometric random walk) in the format get_price_data stores.
+    """
+    rng = _rng(seed, ticker, 'prices')
+    dates = pd.bdate_range(END_DATE - pd.DateOffset(years=years), END_DATE)
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+    open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+    spread = np.abs(rng.normal(0, 0.01, len(dates)))
+    return pd.DataFrame({
+        'date': dates,
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + spread),
+        'low': np.minimum(open_, close) * (1 - spread),
+        'close': close,
+        'volume': rng.integers(1_000_000, 50_000_000, len(dates)),
+    })
+
+def generate_fundamentals(ticker: str, years: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generates quarterly statements in the format get_fundamental_data stores.
+    """
+    rng = _rng(seed, ticker, 'fundamentals')
+    quarters = pd.date_range(END_DATE - pd.DateOffset(years=years), END_DATE, freq='QE')
+    revenue = 1e9 * np.exp(np.cumsum(rng.normal(0.01, 0.05, len(quarters))))
+    net_income = revenue * rng.normal(0.15, 0.05, len(quarters))
+    total_assets = revenue * rng.uniform(3, 5, len(quarters))
+    return pd.DataFrame({
+        'fiscalDateEnding': quarters,
+        'totalRevenue': revenue,
+        'netIncome': net_income,
+        'totalAssets': total_assets,
+        'totalShareholderEquity': total_assets * rng.uniform(0.3, 0.6, len(quarters)),
+        'reportedEPS': net_income / 1e8,
+    })
+
+def generate_news(ticker: str, years: int, headlines_per_day: float = 2.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Generates headlines with UTC publish times in the format fetch_news_articles stores.
+    """
+    rng = _rng(seed, ticker, 'news')
+    start = END_DATE - pd.DateOffset(years=years)
+    count = int(headlines_per_day * (END_DATE - start).days)
+    seconds = rng.integers(0, int((END_DATE - start).total_seconds()), count)
+    published_at = (start + pd.to_timedelta(np.sort(seconds), unit='s')).tz_localize('UTC')
+    return pd.DataFrame({
+        'ticker': ticker,
+        'published_at': published_at,
+        'title': make_headlines(count, seed=int(rng.integers(2**31))),
+        'description': '',
+        'source': 'Synthetic Wire',
+    })
+
+def synthetic_sentiment(title: str) -> dict:
+    """
+    A deterministic stand-in for a FinBERT result, derived from the headline's hash.
+    """
+    digest = hashlib.sha256(title.encode('utf-8')).digest()
+    return {'label': ('positive', 'negative', 'neutral')[digest[0] % 3], 'score': 0.5 + digest[1] / 510}
+
+def write_synthetic_universe(tickers: int = 10, years: int = 3, headlines_per_day: float = 2.0, seed: int = 0) -> list:
+    """
+    Writes raw prices, fundamentals and news for a synthetic universe, fills the macro store from
+    the stub FRED client and pre-scores every headline in the sentiment cache, so every stage
+    can run offline without the FinBERT model.
+
+    Everything is written under the configured DATA_DIR, so point it at a scratch directory first.
+
+    Returns:
+        list: The synthetic ticker names.
+    """
+    from backend.data_processing.fred_stub import StubFredClient
+    from backend.data_processing.macro_store import update_macro_store
+    from backend.feature_engineering import sentiment_cache
+    from backend.feature_engineering.sentiment_engine import get_model_tag
+
+    names = ticker_names(tickers)
+    model_tag = get_model_tag()
+    for ticker in names:
+        write_frame(generate_prices(ticker, years, seed), dataset_path(RAW_DATA_DIR, f"price_{ticker}"))
+        write_frame(generate_fundamentals(ticker, years, seed), dataset_path(RAW_DATA_DIR, f"fundamentals_{ticker}"))
+        news_df = generate_news(ticker, years, headlines_per_day, seed)
+        write_frame(news_df, dataset_path(RAW_DATA_DIR, f"news_{ticker}"))
+        sentiment_cache.store({
+            sentiment_cache.cache_key(title, model_tag): synthetic_sentiment(title) for title in news_df['title']
+        })
+
+    # Macro history reaches back a year further than the prices, so every bar has macro data
+    start_date = (END_DATE - pd.DateOffset(years=years + 1)).strftime('%Y-%m-%d')
+    update_macro_store(client=StubFredClient(end_date=END_DATE.strftime('%Y-%m-%d'), start_date=start_date, seed=seed),
+                       ttl_hours=0)
+    return names
@@ -18,14 +18,68 @@ NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
 # --- Data File Paths ---
 # You can define common data paths here to keep your project organized.
-RAW_DATA_DIR = BASE_DIR / "data/raw/"
-PROCESSED_DATA_DIR = BASE_DIR / "data/processed/"
+# DATA_DIR and MODELS_DIR can be pointed elsewhere (e.g. by the benchmarks) to keep real data untouched.
+DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
+RAW_DATA_DIR = DATA_DIR / "raw"
+PROCESSED_DATA_DIR = DATA_DIR / "processed"
+CACHE_DIR = DATA_DIR / "cache"
+MODELS_DIR = Path(os.getenv("MODELS_DIR", BASE_DIR / "backend/saved_models"))
 
+# --- Storage Backend ---
+# File format used for the datasets passed between pipeline stages: 'parquet', 'feather' or 'csv'.
+# Parquet keeps column types and lets readers load only the columns and rows they need.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "parquet")
 
-# --- Sanity Check ---
-# A quick check to ensure keys are loaded. The script will raise an error if a key is missing.
-if not FRED_API_KEY:
-    raise ValueError("FRED_API_KEY is not set in the .env file.")
+# --- Macroeconomic Data ---
+# FRED series used as model features, mapped to their column names
+MACRO_SERIES = {'DGS10': 'treasury_yield_10y', 'CPIAUCSL': 'cpi'}
+# A stored series is only re-checked for new observations after this many hours
+MACRO_TTL_HOURS = float(os.getenv("MACRO_TTL_HOURS", 12))
+
+# --- Sentiment Model ---
+SENTIMENT_MODEL_ID = "ProsusAI/finbert"
+# Headlines already scored by the model are kept in an on-disk cache. Least recently
+# used entries are evicted once it holds more than this many headlines.
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", 500_000))
+# Inference settings for the shared FinBERT engine. Headlines are short, so truncating to
+# a small max length loses nothing. 0 threads leaves torch's default (all cores).
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", 64))
+SENTIMENT_MAX_LENGTH = int(os.getenv("SENTIMENT_MAX_LENGTH", 128))
+SENTIMENT_NUM_THREADS = int(os.getenv("SENTIMENT_NUM_THREADS", 0))
+# Inference backend for FinBERT: 'torch' (fp32), 'torch_int8' (dynamic int8 quantization),
+# 'onnx' (exported graph on onnxruntime) or 'onnx_int8' (quantized ONNX graph).
+# ONNX artifacts can be prepared ahead of time with backend/download_model.py.
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")
+# Where the exported ONNX graphs are saved, next to the other saved models by default
+SENTIMENT_ONNX_DIR = Path(os.getenv("SENTIMENT_ONNX_DIR", MODELS_DIR))
+
+# --- Instrumentation ---
+# Instrumented stages of a run (e.g. a pipeline run) append their timings to a per-run log here, next to the run reports
+REPORTS_DIR = DATA_DIR / "reports"
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "1") != "0"
+# Name of one stage (e.g. 'unify_features') to run under cProfile, with a .prof dump per call
+PROFILE_STAGE = os.getenv("PROFILE_STAGE")
+# Record each prediction request and background job as a run of its own, with a report per run
+REQUEST_RUN_REPORTS = os.getenv("REQUEST_RUN_REPORTS", "1") != "0"
 
-if not NEWS_API_KEY:
-    raise ValueError("NEWS_API_KEY is not set in the .env file.")
\ No newline at end of file
+# --- Background Jobs ---
+# Worker processes that generate datasets for tickers requested from the dashboard
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+# A job still running this long after it started is treated as lost
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", 900))
+# How often the process that queued jobs confirms it is still alive. Queued jobs whose process
+# missed several heartbeats (e.g. the dashboard was restarted) are marked failed.
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", 15))
+
+
+# --- Sanity Check ---
+# Keys are checked when a code path actually needs them, not at import time, so the
+# dashboard can serve already-built datasets without any API keys configured.
+def require_api_key(name: str) -> str:
+    """
+    Returns an API key from the environment, raising an error if it is missing.
+    """
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"{name} is not set in the .env file.")
+    return value
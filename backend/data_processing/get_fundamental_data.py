@@ -2,12 +2,14 @@
 import pandas as pd
 from pathlib import Path
 import sys
-import yfinance as yf
 
 # add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from backend.config.settings import RAW_DATA_DIR
+from backend.utils.storage import dataset_path, write_frame
+from backend.utils.instrumentation import instrument
 
+@instrument()
 def get_fundamental_data(ticker: str, output_path: Path):
     """
     Fetches and saves real fundamental financial data for a given ticker using yfinance.
@@ -15,6 +17,7 @@ def get_fundamental_data(ticker: str, output_path: Path):
     print(f"📡 Fetching real fundamental data for {ticker}...")
 
     try:
+        import yfinance as yf
         stock = yf.Ticker(ticker)
         
         # Fetch quarterly statements and transpose them
@@ -52,9 +55,8 @@ def get_fundamental_data(ticker: str, output_path: Path):
 
         final_df.reset_index(drop=True, inplace=True)
 
-        # Save to CSV
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        final_df.to_csv(output_path, index=False)
+        # Save in the configured storage format
+        write_frame(final_df, output_path)
 
         print(f"✅ Saved real fundamentals for {ticker} to {output_path}")
 
@@ -64,5 +66,5 @@ def get_fundamental_data(ticker: str, output_path: Path):
 
 if __name__ == "__main__":
     target_ticker = "AAPL"
-    output_file = RAW_DATA_DIR / f"fundamentals_{target_ticker}.csv"
+    output_file = dataset_path(RAW_DATA_DIR, f"fundamentals_{target_ticker}")
     get_fundamental_data(target_ticker, output_file)
\ No newline at end of file
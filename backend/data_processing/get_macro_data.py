@@ -1,5 +1,4 @@
 import pandas as pd
-from fredapi import Fred
 from pathlib import Path
 import sys
 
@@ -7,31 +6,29 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from backend.config.settings import FRED_API_KEY, RAW_DATA_DIR
+from backend.utils.storage import dataset_path, write_frame
+from backend.data_processing.macro_store import update_macro_store, get_macro_frame
+from backend.utils.instrumentation import instrument
 
-def fetch_fred_data(api_key: str, series_ids: dict, output_path: Path):
+@instrument()
+def fetch_fred_data(api_key: str, series_ids: dict, output_path: Path, client=None):
     """
-    Fetches specified macroeconomic series from FRED and saves them to a CSV file.
+    Updates the specified macroeconomic series from FRED and saves the merged frame to a dataset file.
+
+    Series are kept in the macro store and only their new observations are fetched,
+    once their TTL has expired (see macro_store.py).
 
     Args:
         api_key (str): Your FRED API key.
         series_ids (dict): Maps series IDs to desired column names.
-        output_path (Path): The path to save the output CSV file.
+        output_path (Path): The path to save the output dataset file.
+        client: Optional FRED client to use instead of fredapi (e.g. StubFredClient).
     """
     try:
-        fred = Fred(api_key=api_key)
-        data_frames = []
-        for series_id, name in series_ids.items():
-            # Fetch each series and give it a clear name
-            series_data = fred.get_series(series_id).rename(name)
-            data_frames.append(series_data)
-
-        # Combine all data into a single DataFrame and forward-fill missing values
-        macro_data = pd.concat(data_frames, axis=1).ffill().reset_index()
-        macro_data.rename(columns={'index': 'date'}, inplace=True)
-
-        # Create the directory if it doesn't exist
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        macro_data.to_csv(output_path, index=False)
+        update_macro_store(series_ids, api_key=api_key, client=client)
+        macro_data = get_macro_frame(series_ids)
+
+        write_frame(macro_data, output_path)
         print(f"✅ Successfully fetched and saved macro data to {output_path}")
 
     except Exception as e:
@@ -47,6 +44,6 @@ if __name__ == '__main__':
     }
 
     # Define where the output file will be saved
-    output_file = RAW_DATA_DIR / "macro_data.csv"
+    output_file = dataset_path(RAW_DATA_DIR, "macro_data")
 
     fetch_fred_data(api_key=FRED_API_KEY, series_ids=series_to_fetch, output_path=output_file)
\ No newline at end of file
@@ -1,5 +1,4 @@
 import pandas as pd
-from newsapi import NewsApiClient
 from pathlib import Path
 import sys
 
@@ -7,18 +6,22 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from backend.config.settings import NEWS_API_KEY, RAW_DATA_DIR
+from backend.utils.storage import dataset_path, write_frame
+from backend.utils.instrumentation import instrument
 
+@instrument(ticker_arg='query')
 def fetch_news_articles(api_key: str, query: str, output_path: Path, page_size: int = 100):
     """
-    Fetches news articles for a specific query from NewsAPI and saves them to a CSV.
+    Fetches news articles for a specific query from NewsAPI and saves them to a dataset file.
 
     Args:
         api_key (str): Your NewsAPI key.
         query (str): The search term (e.g., company name or ticker).
-        output_path (Path): The path to save the output CSV file.
+        output_path (Path): The path to save the output dataset file.
         page_size (int): Max number of results to return (100 is the max for developer plan).
     """
     try:
+        from newsapi import NewsApiClient
         newsapi = NewsApiClient(api_key=api_key)
         
         # Fetch the most recent and relevant articles
@@ -43,9 +46,7 @@ def fetch_news_articles(api_key: str, query: str, output_path: Path, page_size:
         # Convert publish time to a proper datetime format
         df['published_at'] = pd.to_datetime(df['published_at'])
 
-        # Create the directory if it doesn't exist
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(output_path, index=False)
+        write_frame(df, output_path)
         print(f"✅ Successfully fetched {len(df)} articles for '{query}' and saved to {output_path}")
 
     except Exception as e:
@@ -56,6 +57,6 @@ if __name__ == '__main__':
     target_ticker = "AAPL"
 
     # Define the output path for the raw news file
-    output_file = RAW_DATA_DIR / f"news_{target_ticker}.csv"
+    output_file = dataset_path(RAW_DATA_DIR, f"news_{target_ticker}")
 
     fetch_news_articles(api_key=NEWS_API_KEY, query=target_ticker, output_path=output_file)
\ No newline at end of file
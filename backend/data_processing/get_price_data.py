@@ -1,46 +1,133 @@
 # backend/data_processing/get_price_data.py
 import pandas as pd
-import yfinance as yf
 from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from backend.config.settings import RAW_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame, write_frame
+from backend.utils.instrumentation import instrument
 
-def get_price_data(ticker: str, output_path: Path, start_date="2020-01-01"):
+# How many already-stored trading days to re-download when updating incrementally.
+# All but the last are compared against the stored ones to detect splits or dividend adjustments;
+# the last stored bar may have been fetched intraday, so it is simply replaced.
+OVERLAP_DAYS = 5
+# Relative tolerance when comparing re-downloaded bars with the stored ones
+ADJUSTMENT_TOLERANCE = 1e-4
+
+def _download_prices(ticker: str, start_date) -> pd.DataFrame:
+    """
+    Downloads price bars from Yahoo Finance and standardizes the column names.
+    """
+    import yfinance as yf
+    price_df = yf.download(ticker, start=start_date, auto_adjust=True)
+    if price_df.empty:
+        return price_df
+
+    # Newer yfinance versions return (field, ticker) column pairs even for a single ticker
+    if isinstance(price_df.columns, pd.MultiIndex):
+        price_df.columns = price_df.columns.get_level_values(0)
+
+    # --- IMPORTANT: Standardize column names ---
+    # yfinance returns columns like 'Open', 'High'. We need lowercase.
+    price_df.reset_index(inplace=True)
+    price_df.rename(columns={
+        'Date': 'date',
+        'Open': 'open',
+        'High': 'high',
+        'Low': 'low',
+        'Close': 'close',
+        'Volume': 'volume'
+    }, inplace=True)
+    # ---
+    return price_df
+
+def _has_adjustment(stored_df: pd.DataFrame, fresh_df: pd.DataFrame) -> bool:
+    """
+    Checks whether bars present in both frames disagree, which means history was revised.
+    """
+    stored = stored_df[['date', 'close']].copy()
+    fresh = fresh_df[['date', 'close']].copy()
+    for df in (stored, fresh):
+        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None).dt.normalize()
+        df['close'] = pd.to_numeric(df['close'], errors='coerce')
+
+    overlap = pd.merge(stored, fresh, on='date', suffixes=('_stored', '_fresh'))
+    if overlap.empty:
+        # No common bar to compare against, so we can't trust an append
+        return True
+
+    relative_diff = (overlap['close_fresh'] - overlap['close_stored']).abs() / overlap['close_stored'].abs()
+    return bool((relative_diff > ADJUSTMENT_TOLERANCE).any())
+
+def _update_price_data(ticker: str, output_path: Path, start_date) -> bool:
+    """
+    Appends the bars after the last stored date and replaces the last stored bar, which may have
+    been an intraday snapshot. Returns False if a full refetch is needed.
     """
-    Fetches real historical price data from Yahoo Finance and saves it to a CSV.
-    
+    stored_df = read_frame(output_path)
+    stored_df['date'] = pd.to_datetime(stored_df['date'], errors='coerce')
+    stored_df.dropna(subset=['date'], inplace=True)
+    if stored_df.empty:
+        return False
+
+    stored_dates = stored_df['date'].sort_values()
+    last_date = stored_dates.iloc[-1]
+    overlap_start = stored_dates.iloc[max(len(stored_dates) - OVERLAP_DAYS, 0)]
+
+    fresh_df = _download_prices(ticker, overlap_start.strftime('%Y-%m-%d'))
+    if fresh_df.empty:
+        print(f"No new price data for {ticker}.")
+        return True
+
+    # The last stored bar is left out: an intraday close differing from the final one isn't an adjustment
+    settled_df = stored_df[stored_df['date'] < last_date]
+    if _has_adjustment(settled_df, fresh_df):
+        print(f"⚠️ Stored prices for {ticker} were revised (split or adjustment). Refetching full history...")
+        return False
+
+    fresh_dates = pd.to_datetime(fresh_df['date']).dt.tz_localize(None)
+    appended = int((fresh_dates > last_date).sum())
+    if not (fresh_dates == last_date).any():
+        # The last stored bar wasn't re-downloaded, so keep it rather than leave a gap
+        settled_df = stored_df
+    elif appended == 0 and not _has_adjustment(stored_df[stored_df['date'] == last_date], fresh_df):
+        print(f"Price data for {ticker} is already up to date ({last_date.date()}).")
+        return True
+    new_bars = fresh_df[fresh_dates > settled_df['date'].max()]
+
+    updated_df = pd.concat([settled_df, new_bars[stored_df.columns.intersection(new_bars.columns)]], ignore_index=True)
+    write_frame(updated_df, output_path)
+    print(f"✅ Refreshed the last stored bar and appended {appended} new bars for {ticker} to {output_path}")
+    return True
+
+@instrument()
+def get_price_data(ticker: str, output_path: Path, start_date="2020-01-01", incremental: bool = True):
+    """
+    Fetches real historical price data from Yahoo Finance and saves it to a dataset file.
+
     Args:
         ticker (str): The stock ticker to fetch.
-        output_path (Path): The path to save the output CSV file.
+        output_path (Path): The path to save the output dataset file.
         start_date (str): The start date for the historical data in YYYY-MM-DD format.
+        incremental (bool): If a file already exists, only download the bars after its last date.
+                            The full history is refetched when a split or adjustment is detected.
     """
     print(f"Fetching real historical price data for {ticker} from Yahoo Finance...")
-    
+
     try:
+        if incremental and output_path.exists():
+            if _update_price_data(ticker, output_path, start_date):
+                return
+
         # Download the data
-        price_df = yf.download(ticker, start=start_date, auto_adjust=True)
-        
+        price_df = _download_prices(ticker, start_date)
+
         if price_df.empty:
             print(f"❌ No data found for ticker {ticker}. It may be delisted or invalid.")
             return
 
-        # --- IMPORTANT: Standardize column names ---
-        # yfinance returns columns like 'Open', 'High'. We need lowercase.
-        price_df.reset_index(inplace=True)
-        price_df.rename(columns={
-            'Date': 'date',
-            'Open': 'open',
-            'High': 'high',
-            'Low': 'low',
-            'Close': 'close',
-            'Volume': 'volume'
-        }, inplace=True)
-        # ---
-        
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        price_df.to_csv(output_path, index=False)
+        write_frame(price_df, output_path)
         print(f"✅ Real historical price data for {ticker} saved to {output_path}")
 
     except Exception as e:
@@ -49,5 +136,5 @@ def get_price_data(ticker: str, output_path: Path, start_date="2020-01-01"):
 
 if __name__ == '__main__':
     target_ticker = "AAPL"
-    output_file = RAW_DATA_DIR / f"price_{target_ticker}.csv"
-    get_price_data(target_ticker, output_file)
\ No newline at end of file
+    output_file = dataset_path(RAW_DATA_DIR, f"price_{target_ticker}")
+    get_price_data(target_ticker, output_file)
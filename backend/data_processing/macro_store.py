@@ -0,0 +1,146 @@
+# backend/data_processing/macro_store.py
+import json
+import threading
+import time
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import RAW_DATA_DIR, MACRO_SERIES, MACRO_TTL_HOURS
+from backend.utils.storage import dataset_path, read_frame, write_frame, write_json
+
+# Each FRED series is stored on its own, with a small metadata file tracking
+# its last observation date and when it was last checked for updates.
+MACRO_DIR = RAW_DATA_DIR / "macro"
+METADATA_PATH = MACRO_DIR / "metadata.json"
+
+# In-memory cache of the merged frame: {'key': (series, file signature), 'frame': DataFrame}
+_frame_cache = {}
+_cache_lock = threading.Lock()
+
+def _series_path(series_id: str) -> Path:
+    return dataset_path(MACRO_DIR, series_id)
+
+def _load_metadata() -> dict:
+    if not METADATA_PATH.exists():
+        return {}
+    with open(METADATA_PATH) as f:
+        return json.load(f)
+
+def _save_metadata(metadata: dict):
+    write_json(metadata, METADATA_PATH, indent=2)
+
+def update_series(client, series_id: str, metadata: dict, ttl_hours: float = MACRO_TTL_HOURS) -> int:
+    """
+    Brings one stored series up to date, fetching only observations from its last stored date on.
+
+    Args:
+        client: A fredapi.Fred instance (or StubFredClient for offline use).
+        series_id (str): The FRED series ID.
+        metadata (dict): The store metadata, updated in place.
+        ttl_hours (float): Skip the fetch if the series was checked more recently than this.
+
+    Returns:
+        int: The number of new observations stored.
+    """
+    series_meta = metadata.get(series_id, {})
+    if time.time() - series_meta.get('fetched_at', 0) < ttl_hours * 3600:
+        return 0
+
+    path = _series_path(series_id)
+    last_observation = series_meta.get('last_observation') if path.exists() else None
+
+    # The last stored observation is re-requested so revisions to it are picked up too
+    fetched = client.get_series(series_id, observation_start=last_observation)
+    fetched = fetched.dropna()
+    new_df = pd.DataFrame({'date': pd.to_datetime(fetched.index), 'value': fetched.to_numpy(dtype=float)})
+
+    new_count = 0
+    if not new_df.empty:
+        if last_observation is None:
+            combined = new_df
+            new_count = len(new_df)
+        else:
+            # Fetched observations replace the stored ones from the same dates on
+            stored_df = read_frame(path)
+            combined = pd.concat([stored_df[stored_df['date'] < new_df['date'].min()], new_df], ignore_index=True)
+            new_count = int((new_df['date'] > pd.Timestamp(last_observation)).sum())
+        write_frame(combined, path)
+        series_meta['last_observation'] = combined['date'].max().strftime('%Y-%m-%d')
+
+    series_meta['fetched_at'] = time.time()
+    metadata[series_id] = series_meta
+    return new_count
+
+def update_macro_store(series_ids: dict = None, api_key: str = None, client=None, ttl_hours: float = MACRO_TTL_HOURS):
+    """
+    Updates every series in the store whose TTL has expired.
+
+    Args:
+        series_ids (dict): Maps series IDs to column names. Defaults to MACRO_SERIES.
+        api_key (str): Your FRED API key, used when no client is given.
+        client: A FRED client to use instead of creating one (e.g. StubFredClient).
+        ttl_hours (float): Minimum age before a series is checked again.
+    """
+    series_ids = series_ids or MACRO_SERIES
+    if client is None:
+        from fredapi import Fred
+        client = Fred(api_key=api_key)
+
+    metadata = _load_metadata()
+    for series_id in series_ids:
+        new_count = update_series(client, series_id, metadata, ttl_hours=ttl_hours)
+        if new_count:
+            print(f"✅ Stored {new_count} new observation(s) for {series_id}.")
+    _save_metadata(metadata)
+
+def _store_signature(series_ids: dict) -> tuple:
+    """
+    Identifies the current contents of the store, so the in-memory frame is rebuilt after updates.
+    """
+    signature = []
+    for series_id in series_ids:
+        path = _series_path(series_id)
+        signature.append(path.stat().st_mtime_ns if path.exists() else None)
+    return tuple(series_ids.items()), tuple(signature)
+
+def get_macro_frame(series_ids: dict = None) -> pd.DataFrame:
+    """
+    Returns the merged, forward-filled macro frame (a 'date' column plus one column per series).
+
+    The frame is built once per process and shared by every ticker until the store changes.
+    Treat it as read-only.
+    """
+    series_ids = series_ids or MACRO_SERIES
+    key = _store_signature(series_ids)
+
+    with _cache_lock:
+        if _frame_cache.get('key') == key:
+            return _frame_cache['frame']
+
+        data_frames = []
+        for series_id, name in series_ids.items():
+            path = _series_path(series_id)
+            if path.exists():
+                data_frames.append(read_frame(path).set_index('date')['value'].rename(name))
+
+        if data_frames:
+            # Combine all data into a single DataFrame and forward-fill missing values
+            macro_df = pd.concat(data_frames, axis=1).sort_index().ffill().rename_axis('date').reset_index()
+        else:
+            # Fall back to a merged file written before the store existed
+            macro_df = read_frame(dataset_path(RAW_DATA_DIR, "macro_data")).sort_values('date')
+
+        _frame_cache['key'] = key
+        _frame_cache['frame'] = macro_df
+        return macro_df
+
+if __name__ == '__main__':
+    # Exercise the store offline with the stub FRED client
+    from backend.data_processing.fred_stub import StubFredClient
+    stub = StubFredClient()
+    update_macro_store(client=stub, ttl_hours=0)
+    print(get_macro_frame().tail())
+    print(f"FRED calls: {stub.calls}")
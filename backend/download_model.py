@@ -1,17 +1,26 @@
 # backend/download_model.py
-from transformers import pipeline
+from pathlib import Path
+import sys
 
-def download_and_cache_model():
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from backend.config.settings import SENTIMENT_BACKEND
+
+def download_and_cache_model(backend: str = SENTIMENT_BACKEND):
     """
-    Initializes the FinBERT pipeline, which triggers a one-time
-    download of the model to your local cache.
+    Initializes the FinBERT sentiment engine, which triggers a one-time
+    download of the model to your local cache. For the ONNX backends this
+    also exports (and quantizes) the graph ahead of time.
     """
-    print("--- Starting FinBERT model download (this may take a few minutes)... ---")
+    print(f"--- Starting FinBERT model download for the '{backend}' backend (this may take a few minutes)... ---")
     try:
-        pipeline("sentiment-analysis", model="ProsusAI/finbert")
+        from backend.feature_engineering.sentiment_engine import export_onnx_model, get_sentiment_engine
+        if backend.startswith('onnx'):
+            export_onnx_model(backend)
+        get_sentiment_engine(backend)
         print("✅ Model downloaded and cached successfully!")
     except Exception as e:
         print(f"❌ An error occurred during download: {e}")
 
 if __name__ == '__main__':
-    download_and_cache_model()
\ No newline at end of file
+    # Optionally pass a backend name, e.g. `python backend/download_model.py onnx_int8`
+    download_and_cache_model(sys.argv[1] if len(sys.argv) > 1 else SENTIMENT_BACKEND)
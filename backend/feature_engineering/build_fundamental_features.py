@@ -6,18 +6,21 @@ import numpy as np
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from backend.config.settings import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame, write_frame
+from backend.utils.instrumentation import instrument
 
+@instrument()
 def build_fundamental_features(ticker: str):
     """
     Calculates financial ratios from raw fundamental data with error handling.
     """
     print("Building fundamental features...")
-    raw_path = RAW_DATA_DIR / f"fundamentals_{ticker}.csv"
+    raw_path = dataset_path(RAW_DATA_DIR, f"fundamentals_{ticker}")
     if not raw_path.exists():
         print(f"Fundamental data for {ticker} not found. Skipping.")
         return
 
-    df = pd.read_csv(raw_path, parse_dates=['fiscalDateEnding'])
+    df = read_frame(raw_path)
 
     # --- FIX: Check for columns before doing calculations ---
     # Calculate Return on Equity (ROE)
@@ -34,9 +37,8 @@ def build_fundamental_features(ticker: str):
         df['roa'] = 0 # Default to 0 if columns are missing
     # ---
 
-    output_path = PROCESSED_DATA_DIR / f"fundamental_features_{ticker}.csv"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    output_path = dataset_path(PROCESSED_DATA_DIR, f"fundamental_features_{ticker}")
+    write_frame(df, output_path)
     print("✅ Fundamental features built.")
 
 if __name__ == '__main__':
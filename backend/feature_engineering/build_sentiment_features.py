@@ -1,66 +1,138 @@
 import pandas as pd
-from transformers import pipeline
 from pathlib import Path
 import sys
-import torch
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from backend.config.settings import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame, write_frame
+from backend.feature_engineering import sentiment_cache
+from backend.feature_engineering.sentiment_engine import score_titles, get_model_tag
+from backend.utils.instrumentation import instrument, add_counts
 
+def _load_news(input_path: Path):
+    """
+    Loads a raw news file and keeps only the articles with a usable title.
+    """
+    df = read_frame(input_path)
+
+    # Ensure title column is not empty and is of string type
+    df.dropna(subset=['title'], inplace=True)
+    df['title'] = df['title'].astype(str)
+    return df
+
+def score_with_cache(titles: list) -> list:
+    """
+    Scores headlines, sending only the ones missing from the sentiment cache to FinBERT.
+    Duplicate headlines (after normalization) are scored once.
+
+    Returns:
+        list: One {'label': ..., 'score': ...} dict per title, in input order.
+    """
+    # Headlines scored on a previous run are served from the cache; only new ones go to the model
+    model_tag = get_model_tag()
+    keys = [sentiment_cache.cache_key(title, model_tag) for title in titles]
+    cached = sentiment_cache.lookup(keys)
+    missing = {key: title for key, title in zip(keys, titles) if key not in cached}
+    print(f"Sentiment cache: {len(missing)} unique new headline(s) out of {len(keys)}.")
+    add_counts(cache_hits=len(keys) - len(missing), cache_misses=len(missing))
+
+    if missing:
+        # The FinBERT engine is loaded once per process and shared by every ticker
+        print(f"Analyzing sentiment for {len(missing)} articles... This may take a moment.")
+        scored = score_titles(list(missing.values()))
+        new_results = {key: {'label': result['label'], 'score': result['score']} for key, result in zip(missing, scored)}
+        sentiment_cache.store(new_results)
+        cached.update(new_results)
+
+    return [cached[key] for key in keys]
+
+def _add_sentiment_columns(df: pd.DataFrame, results: list):
+    """
+    Adds the label, score and signed numeric sentiment columns to a news DataFrame.
+    """
+    # Combine sentiment results back into the DataFrame
+    df['sentiment_label'] = [result['label'] for result in results]
+    df['sentiment_score'] = [result['score'] for result in results]
+
+    # Convert label to a numerical value for easier modeling
+    # We multiply the score by +1 for positive, -1 for negative, and 0 for neutral.
+    label_map = {'positive': 1, 'negative': -1, 'neutral': 0}
+    df['sentiment_numeric'] = df['sentiment_label'].map(label_map) * df['sentiment_score']
+
+@instrument()
 def analyze_sentiment(input_path: Path, output_path: Path):
     """
     Loads raw news data, applies sentiment analysis using FinBERT, and saves the results.
 
     Args:
-        input_path (Path): Path to the raw news CSV file.
-        output_path (Path): Path to save the CSV file with sentiment scores.
+        input_path (Path): Path to the raw news dataset file.
+        output_path (Path): Path to save the dataset file with sentiment scores.
     """
     if not input_path.exists():
         print(f"❌ Error: Input file not found at {input_path}")
         return
 
     print("Loading raw news data...")
-    df = pd.read_csv(input_path)
+    df = _load_news(input_path)
 
-    # Ensure title column is not empty and is of string type
-    df.dropna(subset=['title'], inplace=True)
-    df['title'] = df['title'].astype(str)
-    
     # Check if there is any data to process
     if df.empty:
         print("⚠️ No articles with titles found to analyze. Skipping sentiment analysis.")
         return
 
-    print("Initializing FinBERT sentiment analysis pipeline...")
-    # This will download the model on the first run (it's a few hundred MB).
-    # device=0 will use the GPU if available, otherwise it will use the CPU.
-    device = 0 if torch.cuda.is_available() else -1
-    sentiment_pipeline = pipeline("sentiment-analysis", model="ProsusAI/finbert", device=device)
+    _add_sentiment_columns(df, score_with_cache(df['title'].tolist()))
 
-    print(f"Analyzing sentiment for {len(df)} articles... This may take a moment.")
-    results = sentiment_pipeline(df['title'].tolist())
+    write_frame(df, output_path)
+    print(f"✅ Sentiment analysis complete. Enriched data saved to {output_path}")
 
-    # Combine sentiment results back into the DataFrame
-    df['sentiment_label'] = [result['label'] for result in results]
-    df['sentiment_score'] = [result['score'] for result in results]
+@instrument()
+def analyze_sentiment_batch(tickers: list):
+    """
+    Scores the news of many tickers in one deduplicated FinBERT pass, then writes
+    each ticker's sentiment_features file.
 
-    # Convert label to a numerical value for easier modeling
-    # We multiply the score by +1 for positive, -1 for negative, and 0 for neutral.
-    label_map = {'positive': 1, 'negative': -1, 'neutral': 0}
-    df['sentiment_numeric'] = df['sentiment_label'].map(label_map) * df['sentiment_score']
-    
-    # Create the directory if it doesn't exist
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
-    print(f"✅ Sentiment analysis complete. Enriched data saved to {output_path}")
+    Headlines that appear under several tickers are scored only once, and the model
+    sees large, well-filled batches instead of one small batch per ticker.
+
+    Args:
+        tickers (list): The tickers whose raw news files should be scored.
+    """
+    # Gather: load every ticker's news
+    news_by_ticker = {}
+    for ticker in tickers:
+        input_path = dataset_path(RAW_DATA_DIR, f"news_{ticker}")
+        if not input_path.exists():
+            print(f"❌ Error: Input file not found at {input_path}")
+            continue
+        df = _load_news(input_path)
+        if df.empty:
+            print(f"⚠️ No articles with titles found for {ticker}. Skipping sentiment analysis.")
+            continue
+        news_by_ticker[ticker] = df
+
+    if not news_by_ticker:
+        return
+
+    # Score: one pass over every title of every ticker (the cache dedupes repeated headlines)
+    all_titles = [title for df in news_by_ticker.values() for title in df['title']]
+    print(f"Scoring {len(all_titles)} articles across {len(news_by_ticker)} tickers in one pass...")
+    all_results = score_with_cache(all_titles)
+
+    # Scatter: split the results back into each ticker's output
+    offset = 0
+    for ticker, df in news_by_ticker.items():
+        _add_sentiment_columns(df, all_results[offset:offset + len(df)])
+        offset += len(df)
+        write_frame(df, dataset_path(PROCESSED_DATA_DIR, f"sentiment_features_{ticker}"))
+    print(f"✅ Sentiment analysis complete for {len(news_by_ticker)} tickers.")
 
 if __name__ == '__main__':
     target_ticker = "AAPL" # This must match the ticker from get_news_data.py
 
     # Define the input and output paths using our settings
-    raw_news_file = RAW_DATA_DIR / f"news_{target_ticker}.csv"
-    processed_sentiment_file = PROCESSED_DATA_DIR / f"sentiment_features_{target_ticker}.csv"
+    raw_news_file = dataset_path(RAW_DATA_DIR, f"news_{target_ticker}")
+    processed_sentiment_file = dataset_path(PROCESSED_DATA_DIR, f"sentiment_features_{target_ticker}")
 
     analyze_sentiment(input_path=raw_news_file, output_path=processed_sentiment_file)
\ No newline at end of file
@@ -1,30 +1,98 @@
 # backend/feature_engineering/build_technical_features.py
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
 from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from backend.config.settings import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame, write_frame
+from backend.feature_engineering.incremental_indicators import (
+    compute_indicators, update_indicators, load_indicator_state, save_indicator_state
+)
+from backend.utils.instrumentation import instrument
 
-def build_technical_features(ticker: str):
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def _extend_technical_features(ticker: str, df: pd.DataFrame, output_path: Path) -> bool:
+    """
+    Appends indicators for the bars newer than the saved engine state and recomputes the last
+    stored bar, which get_price_data replaces when it was an intraday snapshot.
+    Returns False when the state can't be trusted and a full rebuild is needed.
+    """
+    state = load_indicator_state(ticker)
+    if state is None or state['last_date'] is None or not output_path.exists():
+        return False
+
+    # The stored history must be exactly what the state was built from (no revisions, no gaps)
+    last_date = pd.Timestamp(state['last_date'])
+    seen_bars = df[df['date'] <= last_date]
+    if seen_bars.empty or len(seen_bars) != state['n_bars'] or seen_bars['date'].iloc[-1] != last_date:
+        return False
+
+    previous = state['previous']
+    if previous is not None and previous['n_bars'] == state['n_bars'] - 1:
+        # Roll back to the state before the last stored bar, so that bar is recomputed from its current values
+        state, first_new = previous, len(seen_bars) - 1
+        check_close = seen_bars['close'].iloc[-2] if first_new > 0 else None
+    else:
+        first_new = len(seen_bars)
+        check_close = seen_bars['close'].iloc[-1]
+    if check_close is not None and abs(check_close - state['last_close']) > 1e-9 * max(abs(state['last_close']), 1.0):
+        return False
+
+    existing_df = read_frame(output_path)
+    if len(existing_df) != len(seen_bars):
+        return False
+
+    new_bars = df.iloc[first_new:]
+    # Nothing to do when there are no new bars and the recomputed bar's prices are the stored ones
+    stored_prices = existing_df.iloc[first_new:][PRICE_COLUMNS].to_numpy(dtype=float)
+    if len(new_bars) == len(stored_prices) and np.allclose(
+            new_bars[PRICE_COLUMNS].to_numpy(dtype=float), stored_prices, rtol=1e-12, atol=0, equal_nan=True):
+        print(f"Technical features for {ticker} are already up to date.")
+        return True
+
+    new_rows = pd.concat([new_bars, update_indicators(state, new_bars)], axis=1)
+    write_frame(pd.concat([existing_df.iloc[:first_new], new_rows[existing_df.columns]], ignore_index=True), output_path)
+    save_indicator_state(ticker, state)
+    print(f"✅ Technical features for {ticker} extended by {len(df) - len(seen_bars)} new bars "
+          f"({len(new_bars)} recomputed).")
+    return True
+
+@instrument()
+def build_technical_features(ticker: str, incremental: bool = True):
     """
     Calculates technical indicators and rolling stats from raw price data.
+
+    Args:
+        ticker (str): The stock ticker to build features for.
+        incremental (bool): Extend the existing feature table from the saved indicator state
+                            instead of recomputing the whole history, when possible.
     """
     print(f"Building technical features for {ticker}...")
-    raw_path = RAW_DATA_DIR / f"price_{ticker}.csv"
+    raw_path = dataset_path(RAW_DATA_DIR, f"price_{ticker}")
     if not raw_path.exists():
         print(f"Price data for {ticker} not found. Skipping.")
         return
 
-    df = pd.read_csv(raw_path, parse_dates=['date'])
+    df = read_frame(raw_path)
     
     # --- FIX: Ensure all price-related columns are numeric ---
-    numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Typed storage formats already keep these as numbers, so only coerce what isn't.
+    for col in PRICE_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
     # ---
 
+    df = df.sort_values('date').reset_index(drop=True)
+    output_path = dataset_path(PROCESSED_DATA_DIR, f"technical_features_{ticker}")
+    if incremental and _extend_technical_features(ticker, df, output_path):
+        return
+
+    # pandas_ta is only needed for a full rebuild
+    import pandas_ta as ta  # noqa: F401 (registers the .ta accessor)
+
     df.set_index('date', inplace=True)
     
     # Calculate standard indicators using pandas_ta
@@ -37,9 +105,11 @@ def build_technical_features(ticker: str):
     df['rolling_low_52wk'] = df['low'].rolling(window=window).min()
     
     df.reset_index(inplace=True)
-    output_path = PROCESSED_DATA_DIR / f"technical_features_{ticker}.csv"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    write_frame(df, output_path)
+
+    # Replay the history once so the next run can continue incrementally
+    _, state = compute_indicators(df)
+    save_indicator_state(ticker, state)
     print(f"✅ Technical features built for {ticker}.")
 
 if __name__ == '__main__':
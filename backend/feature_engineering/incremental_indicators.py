@@ -0,0 +1,252 @@
+# backend/feature_engineering/incremental_indicators.py
+import copy
+import json
+from collections import deque
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import PROCESSED_DATA_DIR
+from backend.utils.storage import write_json
+
+# The indicator settings used by build_technical_features
+RSI_LENGTH = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+ROLLING_WINDOW = 252
+
+INDICATOR_COLUMNS = [
+    'RSI_14', 'MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9',
+    'rolling_high_52wk', 'rolling_low_52wk'
+]
+
+STATE_DIR = PROCESSED_DATA_DIR / "indicator_state"
+
+# --- Carried state for each indicator ---
+# Everything below is plain dicts/lists so the state can be saved as JSON between runs,
+# except the rolling windows, which are deques in memory and lists on disk.
+# The state also keeps a copy of itself from before the last bar under 'previous', so a
+# replaced last bar (an intraday snapshot refreshed later) can be recomputed without a rebuild.
+
+def _new_ema_state(length: int) -> dict:
+    # pandas_ta seeds its EMA with the SMA of the first `length` values, then applies alpha = 2 / (length + 1)
+    return {'length': length, 'count': 0, 'sum': 0.0, 'value': None}
+
+def _update_ema(state: dict, x: float):
+    state['count'] += 1
+    if state['value'] is None:
+        state['sum'] += x
+        if state['count'] == state['length']:
+            state['value'] = state['sum'] / state['length']
+    else:
+        alpha = 2.0 / (state['length'] + 1)
+        state['value'] = alpha * x + (1 - alpha) * state['value']
+    return state['value']
+
+def _new_wilder_state(length: int) -> dict:
+    # pandas_ta's RMA is an ewm(alpha=1/length, adjust=True) mean, i.e. a running weighted sum / weight
+    return {'length': length, 'count': 0, 'numerator': 0.0, 'denominator': 0.0}
+
+def _update_wilder(state: dict, x: float):
+    decay = 1.0 - 1.0 / state['length']
+    state['count'] += 1
+    state['numerator'] = x + decay * state['numerator']
+    state['denominator'] = 1.0 + decay * state['denominator']
+    if state['count'] < state['length']:
+        return None
+    return state['numerator'] / state['denominator']
+
+def _new_rolling_state(window: int) -> dict:
+    # Monotonic deque of [position, value] pairs; the front is always the window's extreme
+    return {'window': window, 'deque': deque()}
+
+def _update_rolling(state: dict, position: int, x: float, keep_larger: bool):
+    window_deque = state['deque']
+    while window_deque and ((window_deque[-1][1] <= x) if keep_larger else (window_deque[-1][1] >= x)):
+        window_deque.pop()
+    window_deque.append([position, x])
+    while window_deque[0][0] <= position - state['window']:
+        window_deque.popleft()
+    if position + 1 < state['window']:
+        return None
+    return window_deque[0][1]
+
+def new_indicator_state() -> dict:
+    """
+    Returns the empty state of the indicator engine, before any bar has been seen.
+    """
+    return {
+        'n_bars': 0,
+        'last_date': None,
+        'last_close': None,
+        'rsi_gain': _new_wilder_state(RSI_LENGTH),
+        'rsi_loss': _new_wilder_state(RSI_LENGTH),
+        'ema_fast': _new_ema_state(MACD_FAST),
+        'ema_slow': _new_ema_state(MACD_SLOW),
+        'ema_signal': _new_ema_state(MACD_SIGNAL),
+        'rolling_high': _new_rolling_state(ROLLING_WINDOW),
+        'rolling_low': _new_rolling_state(ROLLING_WINDOW),
+        'previous': None,
+    }
+
+def update_indicators(state: dict, bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extends the indicators by the given bars in O(1) per bar, updating `state` in place.
+
+    Args:
+        state (dict): The engine state from new_indicator_state() or a previous run.
+        bars (pd.DataFrame): New bars, oldest first, with 'date', 'high', 'low' and 'close' columns.
+
+    Returns:
+        pd.DataFrame: The indicator columns for the new bars, aligned to `bars`' index.
+    """
+    nan = float('nan')
+    rows = []
+    last_position = state['n_bars'] + len(bars) - 1
+    for date, high, low, close in zip(bars['date'], bars['high'], bars['low'], bars['close']):
+        position = state['n_bars']
+        if position == last_position:
+            state['previous'] = copy.deepcopy({key: value for key, value in state.items() if key != 'previous'})
+
+        # RSI: Wilder averages of gains and losses, starting from the second bar
+        rsi = nan
+        if state['last_close'] is not None:
+            change = close - state['last_close']
+            avg_gain = _update_wilder(state['rsi_gain'], max(change, 0.0))
+            avg_loss = _update_wilder(state['rsi_loss'], max(-change, 0.0))
+            if avg_gain is not None and (avg_gain + avg_loss) != 0:
+                rsi = 100.0 * avg_gain / (avg_gain + avg_loss)
+
+        # MACD: fast/slow EMAs of close, then an EMA of their difference as the signal line
+        macd = macd_signal = macd_hist = nan
+        fast = _update_ema(state['ema_fast'], close)
+        slow = _update_ema(state['ema_slow'], close)
+        if fast is not None and slow is not None:
+            macd = fast - slow
+            signal = _update_ema(state['ema_signal'], macd)
+            if signal is not None:
+                macd_signal = signal
+                macd_hist = macd - signal
+
+        # 52-week high/low from monotonic deques
+        rolling_high = _update_rolling(state['rolling_high'], position, high, keep_larger=True)
+        rolling_low = _update_rolling(state['rolling_low'], position, low, keep_larger=False)
+
+        rows.append((
+            rsi, macd, macd_hist, macd_signal,
+            nan if rolling_high is None else rolling_high,
+            nan if rolling_low is None else rolling_low
+        ))
+
+        state['n_bars'] += 1
+        state['last_close'] = float(close)
+        state['last_date'] = pd.Timestamp(date).isoformat()
+
+    return pd.DataFrame(rows, columns=INDICATOR_COLUMNS, index=bars.index, dtype=float)
+
+def compute_indicators(price_df: pd.DataFrame):
+    """
+    Replays the whole price history through a fresh engine.
+
+    Returns:
+        tuple: (indicator DataFrame aligned to price_df, engine state after the last bar)
+    """
+    state = new_indicator_state()
+    indicators = update_indicators(state, price_df)
+    return indicators, state
+
+def _state_path(ticker: str) -> Path:
+    return STATE_DIR / f"{ticker}.json"
+
+def load_indicator_state(ticker: str):
+    """
+    Loads the saved engine state for a ticker, or None if there is none.
+    """
+    path = _state_path(ticker)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return _state_from_json(json.load(f))
+
+def save_indicator_state(ticker: str, state: dict):
+    """
+    Saves the engine state for a ticker so the next run can continue from it.
+    """
+    write_json(_state_to_json(state), _state_path(ticker))
+
+def _state_to_json(state: dict) -> dict:
+    rolling = {key: dict(state[key], deque=[list(pair) for pair in state[key]['deque']])
+               for key in ('rolling_high', 'rolling_low')}
+    previous = state.get('previous')
+    return dict(state, **rolling, previous=_state_to_json(previous) if previous is not None else None)
+
+def _state_from_json(state: dict) -> dict:
+    for key in ('rolling_high', 'rolling_low'):
+        state[key]['deque'] = deque(state[key]['deque'])
+    # States saved before 'previous' was kept can't roll back their last bar
+    if state.get('previous') is not None:
+        state['previous'] = _state_from_json(state['previous'])
+    else:
+        state['previous'] = None
+    return state
+
+def verify_against_pandas_ta(price_df: pd.DataFrame, split_at: int = None, tolerance: float = 1e-6) -> dict:
+    """
+    Checks that the engine matches pandas_ta on the same prices, including when the history
+    is processed in two parts (full replay up to `split_at`, then an incremental update).
+
+    Returns:
+        dict: The maximum absolute difference per indicator column.
+
+    Raises:
+        AssertionError: If any column differs by more than `tolerance` or has mismatched NaNs.
+    """
+    import pandas_ta as ta  # noqa: F401 (registers the .ta accessor)
+
+    reference = price_df.set_index('date')
+    reference.ta.rsi(length=RSI_LENGTH, append=True)
+    reference.ta.macd(fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL, append=True)
+    reference['rolling_high_52wk'] = reference['high'].rolling(window=ROLLING_WINDOW).max()
+    reference['rolling_low_52wk'] = reference['low'].rolling(window=ROLLING_WINDOW).min()
+    reference = reference.reset_index()
+
+    split_at = len(price_df) // 2 if split_at is None else split_at
+    head, state = compute_indicators(price_df.iloc[:split_at])
+    state = _state_from_json(json.loads(json.dumps(_state_to_json(state))))  # round-trip like a saved state
+    tail = update_indicators(state, price_df.iloc[split_at:])
+    engine = pd.concat([head, tail])
+
+    max_diffs = {}
+    for column in INDICATOR_COLUMNS:
+        expected = reference[column].to_numpy(dtype=float)
+        actual = engine[column].to_numpy(dtype=float)
+        assert np.array_equal(np.isnan(expected), np.isnan(actual)), f"NaN pattern differs for {column}"
+        valid = ~np.isnan(expected)
+        max_diffs[column] = float(np.max(np.abs(expected[valid] - actual[valid]))) if valid.any() else 0.0
+        assert max_diffs[column] <= tolerance, f"{column} differs by {max_diffs[column]} (> {tolerance})"
+    return max_diffs
+
+def make_synthetic_prices(n_bars: int = 1500, seed: int = 7) -> pd.DataFrame:
+    """
+    Returns a random-walk OHLCV series for parity checks.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n_bars)))
+    return pd.DataFrame({
+        'date': pd.bdate_range('2018-01-01', periods=n_bars),
+        'open': close * (1 + rng.normal(0, 0.003, n_bars)),
+        'high': close * (1 + np.abs(rng.normal(0, 0.01, n_bars))),
+        'low': close * (1 - np.abs(rng.normal(0, 0.01, n_bars))),
+        'close': close,
+        'volume': rng.integers(1_000_000, 5_000_000, n_bars).astype(float),
+    })
+
+if __name__ == '__main__':
+    # Parity check on a synthetic random-walk price series
+    synthetic_prices = make_synthetic_prices()
+    differences = verify_against_pandas_ta(synthetic_prices, split_at=len(synthetic_prices) - 20)
+    print("✅ Incremental indicators match pandas_ta. Max abs differences:")
+    for column, diff in differences.items():
+        print(f"  {column}: {diff:.2e}")
@@ -0,0 +1,116 @@
+# backend/feature_engineering/sentiment_cache.py
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import closing
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import CACHE_DIR, SENTIMENT_CACHE_MAX_ENTRIES
+
+CACHE_PATH = CACHE_DIR / "sentiment_cache.sqlite"
+
+# SQLite limits the number of bound parameters per statement, so lookups are chunked
+_QUERY_CHUNK_SIZE = 500
+
+# Hit/miss counters for this process
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+_stats_lock = threading.Lock()
+
+def normalize_title(title: str) -> str:
+    """
+    Normalizes a headline so trivially different copies (case, spacing, unicode forms) share a cache entry.
+    FinBERT uses an uncased vocabulary, so lowercasing does not change its output.
+    """
+    title = unicodedata.normalize('NFKC', str(title))
+    return re.sub(r'\s+', ' ', title).strip().lower()
+
+def cache_key(title: str, model_id: str) -> str:
+    """
+    Returns the content address of a headline for a given model.
+    """
+    return hashlib.sha256(f"{model_id}\0{normalize_title(title)}".encode('utf-8')).hexdigest()
+
+def _connect() -> sqlite3.Connection:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sentiment ("
+        " key TEXT PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL, last_used REAL NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS sentiment_last_used ON sentiment (last_used)")
+    return conn
+
+def lookup(keys: list) -> dict:
+    """
+    Returns the cached results for the given keys as {key: {'label': ..., 'score': ...}}.
+    Keys that aren't cached are left out of the result.
+    """
+    unique_keys = list(dict.fromkeys(keys))
+    found = {}
+    now = time.time()
+    with closing(_connect()) as conn, conn:
+        for i in range(0, len(unique_keys), _QUERY_CHUNK_SIZE):
+            chunk = unique_keys[i:i + _QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, label, score FROM sentiment WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for key, label, score in rows:
+                found[key] = {'label': label, 'score': score}
+            # Refresh recency so frequently repeated headlines survive eviction
+            conn.executemany("UPDATE sentiment SET last_used = ? WHERE key = ?", [(now, row[0]) for row in rows])
+
+    with _stats_lock:
+        _stats['hits'] += len(found)
+        _stats['misses'] += len(unique_keys) - len(found)
+    return found
+
+def store(results: dict, max_entries: int = SENTIMENT_CACHE_MAX_ENTRIES):
+    """
+    Saves newly scored headlines ({key: {'label': ..., 'score': ...}}) and evicts the
+    least recently used entries beyond `max_entries`.
+    """
+    if not results:
+        return
+    now = time.time()
+    with closing(_connect()) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO sentiment (key, label, score, last_used) VALUES (?, ?, ?, ?)",
+            [(key, result['label'], float(result['score']), now) for key, result in results.items()]
+        )
+        overflow = conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0] - max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM sentiment WHERE key IN (SELECT key FROM sentiment ORDER BY last_used LIMIT ?)",
+                (overflow,)
+            )
+            with _stats_lock:
+                _stats['evictions'] += overflow
+
+def get_cache_stats() -> dict:
+    """
+    Returns this process's hit/miss/eviction counters, the hit rate and the number of cached headlines.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    with closing(_connect()) as conn:
+        stats['entries'] = conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+    return stats
+
+def clear_cache():
+    """
+    Deletes every cached headline and resets the counters.
+    """
+    with closing(_connect()) as conn, conn:
+        conn.execute("DELETE FROM sentiment")
+    with _stats_lock:
+        for counter in _stats:
+            _stats[counter] = 0
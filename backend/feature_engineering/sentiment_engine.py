@@ -0,0 +1,187 @@
+# backend/feature_engineering/sentiment_engine.py
+import threading
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import (
+    SENTIMENT_MODEL_ID, SENTIMENT_BATCH_SIZE, SENTIMENT_MAX_LENGTH, SENTIMENT_NUM_THREADS, SENTIMENT_BACKEND,
+    SENTIMENT_ONNX_DIR
+)
+
+SENTIMENT_BACKENDS = ('torch', 'torch_int8', 'onnx', 'onnx_int8')
+
+# Exported ONNX graphs live next to the other saved models (or in SENTIMENT_ONNX_DIR), so
+# scratch runs that redirect MODELS_DIR don't write into the repository
+ONNX_DIR = SENTIMENT_ONNX_DIR
+ONNX_MODEL_PATHS = {
+    'onnx': ONNX_DIR / "finbert.onnx",
+    'onnx_int8': ONNX_DIR / "finbert-int8.onnx",
+}
+_ONNX_INPUT_NAMES = ['input_ids', 'attention_mask', 'token_type_ids']
+
+# Process-wide engines, created on first use: backend -> {'tokenizer', 'run', 'id2label'}
+# torch and transformers are only imported when an engine is built, since they dominate
+# import time and a fully cached run never needs them.
+_engines = {}
+_engine_lock = threading.Lock()
+
+def get_model_tag(backend: str = SENTIMENT_BACKEND) -> str:
+    """
+    Identifies the model and backend that produced a score. Quantized backends give slightly
+    different scores, so they get their own sentiment cache entries.
+    """
+    return SENTIMENT_MODEL_ID if backend == 'torch' else f"{SENTIMENT_MODEL_ID}:{backend}"
+
+def _load_torch_model(device):
+    from transformers import AutoModelForSequenceClassification
+    # This will download the model on the first run (it's a few hundred MB).
+    model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_ID).to(device)
+    model.eval()
+    return model
+
+def export_onnx_model(backend: str = 'onnx') -> Path:
+    """
+    Exports FinBERT to an ONNX graph (and quantizes it to int8 for 'onnx_int8').
+    Does nothing if the artifact already exists.
+
+    Returns:
+        Path: The path of the ONNX file for the backend.
+    """
+    output_path = ONNX_MODEL_PATHS[backend]
+    if output_path.exists():
+        return output_path
+
+    import torch
+    from transformers import AutoTokenizer
+
+    fp32_path = ONNX_MODEL_PATHS['onnx']
+    if not fp32_path.exists():
+        print(f"Exporting {SENTIMENT_MODEL_ID} to ONNX...")
+        tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_ID)
+        model = _load_torch_model(torch.device('cpu'))
+        dummy = tokenizer(["Stocks rally after earnings beat"], return_tensors='pt')
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in _ONNX_INPUT_NAMES}
+        dynamic_axes['logits'] = {0: 'batch'}
+        fp32_path.parent.mkdir(parents=True, exist_ok=True)
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in _ONNX_INPUT_NAMES),
+            str(fp32_path),
+            input_names=_ONNX_INPUT_NAMES,
+            output_names=['logits'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+        print(f"✅ Exported ONNX model to {fp32_path}")
+
+    if backend == 'onnx_int8':
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        print("Quantizing the ONNX model to int8...")
+        quantize_dynamic(str(fp32_path), str(output_path), weight_type=QuantType.QInt8)
+        print(f"✅ Saved quantized ONNX model to {output_path}")
+    return output_path
+
+def _build_engine(backend: str) -> dict:
+    """
+    Loads the tokenizer and the model for a backend, wrapped in a common run(batch) -> logits function.
+    """
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{backend}'. Expected one of {SENTIMENT_BACKENDS}.")
+
+    print(f"Initializing FinBERT sentiment engine ({backend})...")
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_ID)
+
+    if backend in ('torch', 'torch_int8'):
+        import torch
+        if SENTIMENT_NUM_THREADS > 0:
+            torch.set_num_threads(SENTIMENT_NUM_THREADS)
+        # Use the GPU if available, otherwise the CPU. Dynamic quantization is CPU-only.
+        use_cuda = torch.cuda.is_available() and backend == 'torch'
+        device = torch.device('cuda' if use_cuda else 'cpu')
+        model = _load_torch_model(device)
+        if backend == 'torch_int8':
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        id2label = model.config.id2label
+
+        def run(batch: dict) -> np.ndarray:
+            tensors = {name: torch.as_tensor(values).to(device) for name, values in batch.items()}
+            with torch.inference_mode():
+                return model(**tensors).logits.float().cpu().numpy()
+    else:
+        import onnxruntime as ort
+        from transformers import AutoConfig
+
+        options = ort.SessionOptions()
+        if SENTIMENT_NUM_THREADS > 0:
+            options.intra_op_num_threads = SENTIMENT_NUM_THREADS
+        session = ort.InferenceSession(
+            str(export_onnx_model(backend)), options, providers=['CPUExecutionProvider']
+        )
+        session_inputs = {node.name for node in session.get_inputs()}
+        id2label = AutoConfig.from_pretrained(SENTIMENT_MODEL_ID).id2label
+
+        def run(batch: dict) -> np.ndarray:
+            feeds = {name: np.asarray(values, dtype=np.int64) for name, values in batch.items() if name in session_inputs}
+            return session.run(['logits'], feeds)[0]
+
+    return {'tokenizer': tokenizer, 'run': run, 'id2label': id2label}
+
+def get_sentiment_engine(backend: str = SENTIMENT_BACKEND) -> dict:
+    """
+    Returns the shared FinBERT engine for a backend, loading it once per process.
+    """
+    if backend not in _engines:
+        with _engine_lock:
+            if backend not in _engines:
+                _engines[backend] = _build_engine(backend)
+    return _engines[backend]
+
+def score_titles(titles: list, batch_size: int = SENTIMENT_BATCH_SIZE, max_length: int = SENTIMENT_MAX_LENGTH,
+                 backend: str = SENTIMENT_BACKEND) -> list:
+    """
+    Scores headlines with FinBERT in length-sorted batches.
+
+    Titles are tokenized once, sorted by token count and padded only up to the longest
+    title in each batch, so short headlines don't pay for long ones.
+
+    Args:
+        titles (list): The headlines to score.
+        batch_size (int): Headlines per forward pass.
+        max_length (int): Titles are truncated to this many tokens.
+        backend (str): The inference backend (see SENTIMENT_BACKENDS).
+
+    Returns:
+        list: One {'label': ..., 'score': ...} dict per title, in input order
+              (same format as the transformers sentiment-analysis pipeline).
+    """
+    if not titles:
+        return []
+
+    engine = get_sentiment_engine(backend)
+    tokenizer = engine['tokenizer']
+
+    encodings = tokenizer([str(title) for title in titles], truncation=True, max_length=max_length)
+    order = sorted(range(len(titles)), key=lambda i: len(encodings['input_ids'][i]))
+
+    results = [None] * len(titles)
+    for start in range(0, len(order), batch_size):
+        batch_indices = order[start:start + batch_size]
+        batch = tokenizer.pad(
+            {name: [values[i] for i in batch_indices] for name, values in encodings.items()},
+            padding='longest',
+            return_tensors='np'
+        )
+        logits = engine['run'](dict(batch))
+
+        # Softmax in numpy so every backend shares the same post-processing
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=-1, keepdims=True)
+        label_ids = probabilities.argmax(axis=-1)
+        for i, label_id, row in zip(batch_indices, label_ids, probabilities):
+            results[i] = {'label': engine['id2label'][int(label_id)], 'score': float(row[label_id])}
+    return results
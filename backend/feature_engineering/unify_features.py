@@ -1,23 +1,37 @@
 # backend/feature_engineering/unify_features.py
+import json
 import pandas as pd
 from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
-from backend.config.settings import PROCESSED_DATA_DIR, RAW_DATA_DIR
+from backend.config.settings import PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame, write_frame, write_json
+from backend.utils import feature_store
+from backend.data_processing.macro_store import get_macro_frame
+from backend.utils.instrumentation import instrument
+from backend.ml_models.feature_schema import hash_frame
 
-def unify_features(ticker: str):
-    """
-    Combines all feature sets (including macro) into a single master dataset.
+FUNDAMENTAL_COLUMNS = ['reportedEPS', 'totalRevenue', 'netIncome', 'totalShareholderEquity', 'totalAssets', 'roe', 'roa']
+
+# The target looks this many rows ahead, so new bars change the label of the rows before them
+TARGET_HORIZON = 60
+
+# Per-ticker watermarks of the inputs each master dataset was built from
+STATE_DIR = PROCESSED_DATA_DIR / "unify_state"
+
+# Returned by _affected_start when the stored history itself changed
+REBUILD = 'rebuild'
+
+def _build_master(tech_df: pd.DataFrame, funda_df: pd.DataFrame, senti_df: pd.DataFrame, macro_df: pd.DataFrame,
+                  funda_seed: pd.DataFrame = None) -> pd.DataFrame:
     """
-    print("Unifying all features...")
-    
-    # --- Load Data ---
-    tech_df = pd.read_csv(PROCESSED_DATA_DIR / f"technical_features_{ticker}.csv", parse_dates=['date'])
-    funda_df = pd.read_csv(PROCESSED_DATA_DIR / f"fundamental_features_{ticker}.csv", parse_dates=['fiscalDateEnding'])
-    senti_df = pd.read_csv(PROCESSED_DATA_DIR / f"sentiment_features_{ticker}.csv", parse_dates=['published_at'])
-    macro_df = pd.read_csv(RAW_DATA_DIR / "macro_data.csv", parse_dates=['date'])
+    Merges one ticker's feature sets into master rows and adds the prediction target.
 
+    Args:
+        funda_seed (pd.DataFrame): The last master row before tech_df starts, used to continue
+                                   the fundamental forward-fill when only a tail is rebuilt.
+    """
     # --- Process and Merge ---
     senti_df['date'] = pd.to_datetime(senti_df['published_at'].dt.date)
     daily_sentiment = senti_df.groupby('date')['sentiment_numeric'].mean().rename('avg_sentiment')
@@ -28,7 +42,7 @@ def unify_features(ticker: str):
     
     master_df = pd.merge_asof(
         master_df.sort_values('date'),
-        macro_df.sort_values('date'),
+        macro_df,
         on='date',
         direction='backward'
     )
@@ -42,21 +56,324 @@ def unify_features(ticker: str):
     )
     
     # --- FIX: Only forward-fill the fundamental columns that actually exist ---
-    all_funda_cols = ['reportedEPS', 'totalRevenue', 'netIncome', 'totalShareholderEquity', 'totalAssets', 'roe', 'roa']
-    existing_funda_cols = [col for col in all_funda_cols if col in master_df.columns]
-    master_df[existing_funda_cols] = master_df[existing_funda_cols].ffill()
+    existing_funda_cols = [col for col in FUNDAMENTAL_COLUMNS if col in master_df.columns]
+    if funda_seed is not None and not funda_seed.empty:
+        seeded = pd.concat([funda_seed[existing_funda_cols], master_df[existing_funda_cols]], ignore_index=True)
+        master_df[existing_funda_cols] = seeded.ffill().iloc[len(funda_seed):].to_numpy()
+    else:
+        master_df[existing_funda_cols] = master_df[existing_funda_cols].ffill()
     # ---
 
     # --- Create Prediction Target ---
-    master_df['target'] = (master_df['close'].shift(-60) > master_df['close'] * 1.05).astype(int)
+    master_df['target'] = (master_df['close'].shift(-TARGET_HORIZON) > master_df['close'] * 1.05).astype(int)
     
     # --- Final Cleanup ---
     master_df.dropna(inplace=True)
+    return master_df
+
+def _state_path(ticker: str) -> Path:
+    return STATE_DIR / f"{ticker}.json"
+
+def load_unify_state(ticker: str):
+    """
+    Loads the input watermarks of a ticker's master dataset, or None if there are none.
+    """
+    path = _state_path(ticker)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_unify_state(ticker: str, state: dict):
+    """
+    Saves the input watermarks of a ticker's master dataset.
+    """
+    write_json(state, _state_path(ticker), indent=2)
+
+def _sorted_technical(tech_df: pd.DataFrame) -> pd.DataFrame:
+    return tech_df.dropna(subset=['date']).sort_values('date', kind='stable').reset_index(drop=True)
+
+def _technical_watermark(tech_df: pd.DataFrame) -> dict:
+    """
+    Records the last date and row count of a technical feature table, plus content hashes of its
+    settled rows and of its last row, so revised values are caught even when no date moves.
+    """
+    tech_df = _sorted_technical(tech_df)
+    return {
+        'last': tech_df['date'].iloc[-1].isoformat() if not tech_df.empty else None,
+        'rows': len(tech_df),
+        'settled_hash': hash_frame(tech_df.iloc[:-1]),
+        'last_hash': hash_frame(tech_df.iloc[-1:]),
+    }
+
+def _source_watermarks(technical: dict, funda_df: pd.DataFrame, senti_df: pd.DataFrame, macro_df: pd.DataFrame) -> dict:
+    """
+    Records the technical watermark and the latest date seen in each other input source.
+    """
+    def latest(series):
+        series = series.dropna()
+        return series.max().isoformat() if not series.empty else None
+
+    return {
+        'technical': technical,
+        'fundamental': {'last': latest(funda_df['fiscalDateEnding'])},
+        'sentiment': {'last': latest(senti_df['published_at'])},
+        'macro': {'last': latest(macro_df['date'])},
+    }
+
+def _affected_start(state: dict, tech_df: pd.DataFrame, funda_df: pd.DataFrame, senti_df: pd.DataFrame, macro_df: pd.DataFrame):
+    """
+    Finds the earliest master row that new input data can change.
+
+    Returns:
+        The first affected date, None if nothing changed, or REBUILD if the stored
+        history itself changed and only a full rebuild is safe.
+    """
+    candidates = []
+
+    tech_df = _sorted_technical(tech_df)
+    tech_state = state['technical']
+    # States saved before content hashes were recorded can't rule out revised values
+    if tech_state['last'] is None or 'settled_hash' not in tech_state:
+        return REBUILD
+    old_rows = int((tech_df['date'] <= pd.Timestamp(tech_state['last'])).sum())
+    if old_rows != tech_state['rows']:
+        return REBUILD
+    if hash_frame(tech_df.iloc[:old_rows - 1]) != tech_state['settled_hash']:
+        # Settled history was revised (e.g. a split refetch followed by an indicator rebuild)
+        return REBUILD
+    # The last stored bar may have been an intraday snapshot that has since been replaced
+    last_changed = hash_frame(tech_df.iloc[old_rows - 1:old_rows]) != tech_state['last_hash']
+    first_changed = old_rows - 1 if last_changed else old_rows
+    if first_changed < len(tech_df):
+        # Changed or new bars complete the targets of the TARGET_HORIZON rows before them
+        candidates.append(tech_df['date'].iloc[max(0, first_changed - TARGET_HORIZON)])
+
+    for source, dates in (('fundamental', funda_df['fiscalDateEnding']), ('sentiment', senti_df['published_at'])):
+        watermark = state[source]['last']
+        new_dates = dates.dropna()
+        if watermark is not None:
+            new_dates = new_dates[new_dates > pd.Timestamp(watermark)]
+        if not new_dates.empty:
+            earliest = new_dates.min()
+            candidates.append(pd.Timestamp(earliest.date()) if source == 'sentiment' else earliest)
+
+    macro_watermark = state['macro']['last']
+    if macro_watermark is None or macro_df['date'].max() > pd.Timestamp(macro_watermark):
+        # The last stored observation may have been revised along with the new ones
+        candidates.append(pd.Timestamp(macro_watermark) if macro_watermark else macro_df['date'].min())
+
+    return min(candidates) if candidates else None
+
+@instrument()
+def unify_features(ticker: str, incremental: bool = True):
+    """
+    Combines all feature sets (including macro) into a single master dataset.
+
+    With incremental=True and an existing master dataset, only the rows that new input data can
+    change are recomputed: everything from the earliest new or replaced bar, report or headline on,
+    plus the TARGET_HORIZON rows whose target depends on those bars. Older rows are kept as they are,
+    unless older technical rows were revised, which forces a full rebuild.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        incremental (bool): If True, update the existing master dataset instead of rebuilding it.
+    """
+    print("Unifying all features...")
+    tech_path = dataset_path(PROCESSED_DATA_DIR, f"technical_features_{ticker}")
+    output_path = dataset_path(PROCESSED_DATA_DIR, f"master_dataset_{ticker}")
+    
+    # --- Load Data ---
+    funda_df = read_frame(dataset_path(PROCESSED_DATA_DIR, f"fundamental_features_{ticker}"))
+    senti_df = read_frame(dataset_path(PROCESSED_DATA_DIR, f"sentiment_features_{ticker}"), columns=['published_at', 'sentiment_numeric'])
+    # Macro data is the same for every ticker, so it comes from the shared in-memory frame
+    macro_df = get_macro_frame()
+    tech_df = read_frame(tech_path)
+
+    state = load_unify_state(ticker) if incremental and output_path.exists() else None
+    start = _affected_start(state, tech_df, funda_df, senti_df, macro_df) if state else REBUILD
+
+    if start is None:
+        print(f"✅ Master dataset for {ticker} is already up to date.")
+        return read_frame(output_path)
 
-    output_path = PROCESSED_DATA_DIR / f"master_dataset_{ticker}.csv"
-    master_df.to_csv(output_path, index=False)
+    if start is REBUILD:
+        master_df = _build_master(tech_df, funda_df, senti_df, macro_df)
+    else:
+        # Only the affected tail is rebuilt, the rows before it are kept
+        kept_df = read_frame(output_path, filters=[('date', '<', start)])
+        tail_tech_df = tech_df[tech_df['date'] >= start]
+        tail_df = _build_master(tail_tech_df, funda_df, senti_df, macro_df, funda_seed=kept_df.tail(1))
+        if not kept_df.empty and list(tail_df.columns) != list(kept_df.columns):
+            print("⚠️ Feature columns changed since the last build. Rebuilding the full master dataset.")
+            master_df = _build_master(tech_df, funda_df, senti_df, macro_df)
+        else:
+            master_df = pd.concat([kept_df, tail_df], ignore_index=True)
+            print(f"Recomputed {len(tail_df)} rows from {start.date()} on, kept {len(kept_df)}.")
+
+    write_frame(master_df, output_path)
+    feature_store.invalidate(ticker)
+    save_unify_state(ticker, _source_watermarks(_technical_watermark(tech_df), funda_df, senti_df, macro_df))
     print(f"✅ Master dataset created with {len(master_df)} rows, now including macro data.")
     return master_df
 
+def _load_panel_inputs(tickers: list):
+    """
+    Loads every ticker's technical, fundamental and sentiment features into long (ticker, date) frames.
+
+    Returns:
+        tuple: (tech_panel, funda_panel, senti_panel, columns_by_ticker, tech_watermarks), where
+               columns_by_ticker records which columns each ticker's inputs actually had and
+               tech_watermarks holds each ticker's technical watermark, taken before the concat
+               can change its columns or dtypes.
+    """
+    tech_frames, funda_frames, senti_frames = [], [], []
+    columns_by_ticker, tech_watermarks = {}, {}
+    for ticker in tickers:
+        try:
+            tech_df = read_frame(dataset_path(PROCESSED_DATA_DIR, f"technical_features_{ticker}"))
+            funda_df = read_frame(dataset_path(PROCESSED_DATA_DIR, f"fundamental_features_{ticker}"))
+            senti_df = read_frame(dataset_path(PROCESSED_DATA_DIR, f"sentiment_features_{ticker}"), columns=['published_at', 'sentiment_numeric'])
+        except FileNotFoundError as e:
+            print(f"❌ Missing feature data for {ticker}, leaving it out of the panel. Error: {e}")
+            continue
+
+        columns_by_ticker[ticker] = set(tech_df.columns) | set(funda_df.columns)
+        tech_watermarks[ticker] = _technical_watermark(tech_df)
+        tech_frames.append(tech_df.assign(ticker=ticker))
+        funda_frames.append(funda_df.assign(ticker=ticker))
+        senti_frames.append(senti_df.assign(ticker=ticker))
+
+    if not tech_frames:
+        return None, None, None, {}, {}
+    return (pd.concat(tech_frames, ignore_index=True), pd.concat(funda_frames, ignore_index=True),
+            pd.concat(senti_frames, ignore_index=True), columns_by_ticker, tech_watermarks)
+
+@instrument()
+def unify_features_panel(tickers: list) -> pd.DataFrame:
+    """
+    Builds the master datasets of many tickers in one vectorized pass over a long (ticker, date) panel.
+
+    Produces the same rows as calling unify_features for each ticker, but the sentiment groupby,
+    the macro and fundamental as-of joins, the target and the cleanup each run once for the whole
+    universe. The result is written partitioned by ticker, one master_dataset_{ticker} file per partition.
+
+    Args:
+        tickers (list): The tickers to unify.
+
+    Returns:
+        pd.DataFrame: The unified panel, with a 'ticker' column.
+    """
+    print(f"Unifying features for {len(tickers)} tickers in one panel pass...")
+    tech_panel, funda_panel, senti_panel, columns_by_ticker, tech_watermarks = _load_panel_inputs(tickers)
+    if tech_panel is None:
+        print("⚠️ No feature data found for any ticker. Nothing to unify.")
+        return pd.DataFrame()
+
+    # --- Process and Merge ---
+    senti_panel['date'] = pd.to_datetime(senti_panel['published_at'].dt.date)
+    daily_sentiment = senti_panel.groupby(['ticker', 'date'])['sentiment_numeric'].mean().rename('avg_sentiment')
+
+    panel_df = pd.merge(tech_panel, daily_sentiment.reset_index(), on=['ticker', 'date'], how='left')
+    panel_df['avg_sentiment'] = panel_df['avg_sentiment'].fillna(0)
+    panel_df.dropna(subset=['date'], inplace=True)
+
+    # Macro data is shared by every ticker, so a plain as-of join on date covers the whole panel
+    macro_df = get_macro_frame()
+    panel_df = pd.merge_asof(panel_df.sort_values('date'), macro_df, on='date', direction='backward')
+
+    panel_df = pd.merge_asof(
+        panel_df,
+        funda_panel.sort_values('fiscalDateEnding'),
+        left_on='date',
+        right_on='fiscalDateEnding',
+        by='ticker',
+        direction='backward'
+    )
+
+    # Back to per-ticker chronological order, so forward-fills and shifts stay within a ticker
+    panel_df = panel_df.sort_values(['ticker', 'date'], kind='stable').reset_index(drop=True)
+    by_ticker = panel_df.groupby('ticker', sort=False)
+
+    existing_funda_cols = [col for col in FUNDAMENTAL_COLUMNS if col in panel_df.columns]
+    panel_df[existing_funda_cols] = by_ticker[existing_funda_cols].ffill()
+
+    # --- Create Prediction Target ---
+    panel_df['target'] = (by_ticker['close'].shift(-TARGET_HORIZON) > panel_df['close'] * 1.05).astype(int)
+
+    # --- Final Cleanup ---
+    # A column that a ticker's inputs never had must not drop that ticker's rows,
+    # just as it wouldn't exist at all when the ticker is unified on its own.
+    input_columns = set().union(*columns_by_ticker.values())
+    absent = pd.DataFrame(False, index=panel_df.index, columns=panel_df.columns)
+    for ticker, ticker_columns in columns_by_ticker.items():
+        missing_columns = list(input_columns - ticker_columns)
+        if missing_columns:
+            absent.loc[panel_df['ticker'] == ticker, missing_columns] = True
+    panel_df = panel_df[(panel_df.notna() | absent).all(axis=1)]
+
+    # --- Write one partition per ticker ---
+    funda_groups = dict(tuple(funda_panel.groupby('ticker')))
+    senti_groups = dict(tuple(senti_panel.groupby('ticker')))
+    for ticker, ticker_df in panel_df.groupby('ticker', sort=False):
+        missing_columns = list(input_columns - columns_by_ticker[ticker])
+        write_frame(
+            ticker_df.drop(columns=['ticker'] + missing_columns),
+            dataset_path(PROCESSED_DATA_DIR, f"master_dataset_{ticker}")
+        )
+        feature_store.invalidate(ticker)
+        # Record what the partition was built from, so unify_features can update it incrementally
+        save_unify_state(ticker, _source_watermarks(
+            tech_watermarks[ticker], funda_groups.get(ticker, funda_panel.iloc[:0]),
+            senti_groups.get(ticker, senti_panel.iloc[:0]), macro_df
+        ))
+
+    print(f"✅ Master datasets created for {panel_df['ticker'].nunique()} tickers ({len(panel_df)} rows).")
+    return panel_df
+
+def refresh_master_datasets(tickers: list) -> set:
+    """
+    Brings the master datasets of many tickers up to date with their inputs.
+
+    Tickers built before (a master dataset plus its input watermarks) are updated with
+    unify_features(incremental=True), so only the tail that new bars, reports, headlines or
+    macro observations can change is recomputed, and unchanged tickers aren't rewritten at all.
+    Tickers without a master dataset are built together in one unify_features_panel pass.
+
+    Args:
+        tickers (list): The tickers to refresh.
+
+    Returns:
+        set: The tickers whose master dataset is now up to date.
+    """
+    existing = [ticker for ticker in tickers
+                if dataset_path(PROCESSED_DATA_DIR, f"master_dataset_{ticker}").exists() and load_unify_state(ticker)]
+    new = [ticker for ticker in tickers if ticker not in existing]
+
+    refreshed = set()
+    if new:
+        panel_df = unify_features_panel(new)
+        if not panel_df.empty:
+            refreshed.update(panel_df['ticker'].unique())
+
+    for ticker in existing:
+        try:
+            unify_features(ticker, incremental=True)
+            refreshed.add(ticker)
+        except Exception as e:
+            print(f"❌ Incremental unification failed for {ticker}. Error: {e}")
+    return refreshed
+
+def read_master_panel(tickers: list, columns: list = None) -> pd.DataFrame:
+    """
+    Reads the master datasets of many tickers back as one long frame with a 'ticker' column.
+    """
+    frames = []
+    for ticker in tickers:
+        path = dataset_path(PROCESSED_DATA_DIR, f"master_dataset_{ticker}")
+        if path.exists():
+            frames.append(read_frame(path, columns=columns).assign(ticker=ticker))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
 if __name__ == '__main__':
     unify_features("AAPL")
\ No newline at end of file
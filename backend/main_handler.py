@@ -2,66 +2,133 @@
 import pandas as pd
 from pathlib import Path
 import sys
+import time
 
 # Add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-# Import all necessary functions for the on-demand pipeline
-from backend.config.settings import PROCESSED_DATA_DIR, RAW_DATA_DIR, NEWS_API_KEY
-from backend.data_processing.get_fundamental_data import get_fundamental_data
-from backend.data_processing.get_price_data import get_price_data
-from backend.data_processing.get_news_data import fetch_news_articles
-from backend.feature_engineering.build_fundamental_features import build_fundamental_features
-from backend.feature_engineering.build_technical_features import build_technical_features
-from backend.feature_engineering.build_sentiment_features import analyze_sentiment
-from backend.feature_engineering.unify_features import unify_features
-from backend.ml_models.predict import make_prediction
-from backend.ml_models.explain import explain_prediction
-
-def generate_data_for_ticker(ticker: str):
+# Only the serving path is imported up front. The on-demand pipeline modules are imported
+# inside generate_data_for_ticker, so serving an existing dataset stays cheap to start.
+from backend.config.settings import PROCESSED_DATA_DIR, RAW_DATA_DIR, require_api_key
+from backend.utils.storage import dataset_path
+from backend.utils import feature_store
+from backend.utils.locking import file_lock, single_flight
+from backend.ml_models.predict import make_batch_prediction
+from backend.ml_models.fast_inference import make_fast_prediction
+from backend.ml_models.explain import explain_prediction, explain_batch
+from backend.utils.instrumentation import instrument, recorded_run
+
+# The on-demand stages in order, as reported to progress callbacks
+GENERATION_STAGES = [
+    'fundamentals', 'prices', 'news',
+    'fundamental_features', 'technical_features', 'sentiment_features', 'unification'
+]
+
+@instrument()
+def generate_data_for_ticker(ticker: str, progress=None):
     """
     Runs the full data pipeline for a single ticker on-demand.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        progress (callable): Called as progress(stage, fraction_done) before each stage and
+                             once more with ('done', 1.0) at the end.
     """
+    # Only one process at a time writes this ticker's datasets
+    with file_lock(f"ticker_{ticker}"):
+        _run_generation_stages(ticker, progress)
+
+def _run_generation_stages(ticker: str, progress=None):
+    from backend.data_processing.get_fundamental_data import get_fundamental_data
+    from backend.data_processing.get_price_data import get_price_data
+    from backend.data_processing.get_news_data import fetch_news_articles
+    from backend.feature_engineering.build_fundamental_features import build_fundamental_features
+    from backend.feature_engineering.build_technical_features import build_technical_features
+    from backend.feature_engineering.build_sentiment_features import analyze_sentiment
+    from backend.feature_engineering.unify_features import unify_features
+
+    def report(stage: str):
+        if progress is not None:
+            stages_done = len(GENERATION_STAGES) if stage == 'done' else GENERATION_STAGES.index(stage)
+            progress(stage, stages_done / len(GENERATION_STAGES))
+
     print(f"--- On-demand data generation started for {ticker} ---")
+    news_api_key = require_api_key("NEWS_API_KEY")
+
     # Phase 1: Data Collection
-    get_fundamental_data(ticker, RAW_DATA_DIR / f"fundamentals_{ticker}.csv")
-    get_price_data(ticker, RAW_DATA_DIR / f"price_{ticker}.csv")
-    fetch_news_articles(NEWS_API_KEY, ticker, RAW_DATA_DIR / f"news_{ticker}.csv")
+    report('fundamentals')
+    get_fundamental_data(ticker, dataset_path(RAW_DATA_DIR, f"fundamentals_{ticker}"))
+    report('prices')
+    get_price_data(ticker, dataset_path(RAW_DATA_DIR, f"price_{ticker}"))
+    report('news')
+    fetch_news_articles(news_api_key, ticker, dataset_path(RAW_DATA_DIR, f"news_{ticker}"))
     
     # Phase 2: Feature Engineering
+    report('fundamental_features')
     build_fundamental_features(ticker)
+    report('technical_features')
     build_technical_features(ticker)
+    report('sentiment_features')
     analyze_sentiment(
-        RAW_DATA_DIR / f"news_{ticker}.csv", 
-        PROCESSED_DATA_DIR / f"sentiment_features_{ticker}.csv"
+        dataset_path(RAW_DATA_DIR, f"news_{ticker}"),
+        dataset_path(PROCESSED_DATA_DIR, f"sentiment_features_{ticker}")
     )
     
     # Phase 3: Unification
+    report('unification')
     unify_features(ticker)
+    report('done')
     print(f"--- On-demand data generation finished for {ticker} ---")
 
+def _generate_if_missing(ticker: str, progress=None):
+    """
+    Generates a ticker's master dataset unless another process did so while we waited for the lock.
+    """
+    with file_lock(f"ticker_{ticker}"):
+        if not feature_store.get_master_path(ticker).exists():
+            _run_generation_stages(ticker, progress)
+
+def ensure_master_dataset(ticker: str, progress=None):
+    """
+    Makes sure a ticker's master dataset exists, generating it on-demand at most once.
+
+    Concurrent callers in this process share a single generation run, and callers in other
+    processes wait on a file lock and then find the dataset already built.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        progress (callable): Passed to generate_data_for_ticker if this call runs the generation.
+    """
+    if not feature_store.get_master_path(ticker).exists():
+        print(f"Master dataset for {ticker} not found. Generating on-demand...")
+        single_flight(f"generate_{ticker}", _generate_if_missing, ticker, progress)
+
+@instrument()
 def get_latest_features(ticker: str):
     """
     Loads the master dataset for a ticker. If it doesn't exist, it generates it.
     """
-    master_dataset_path = PROCESSED_DATA_DIR / f"master_dataset_{ticker}.csv"
-    
-    # If the file doesn't exist, run the on-demand generation pipeline
-    if not master_dataset_path.exists():
-        print(f"Master dataset for {ticker} not found. Generating on-demand...")
-        generate_data_for_ticker(ticker)
+    master_dataset_path = feature_store.get_master_path(ticker)
+
+    # If the file doesn't exist, run the on-demand generation pipeline (once, however many callers)
+    ensure_master_dataset(ticker)
 
     if not master_dataset_path.exists():
          raise FileNotFoundError(f"Master dataset for {ticker} could not be created.")
 
-    df = pd.read_csv(master_dataset_path, parse_dates=['date'])
-    df.sort_values(by='date', inplace=True)
-    return df.tail(1)
+    # Served from the feature store's in-memory cache, which notices when the dataset is rewritten
+    return feature_store.get_latest(ticker)
 
 def get_prediction_for_ticker(ticker: str):
     """
     Orchestrates the prediction pipeline for a single ticker.
+    Each call is recorded as its own run, with a stage timing report in REPORTS_DIR.
     """
+    with recorded_run(f"prediction_{ticker}"):
+        return _get_prediction_for_ticker(ticker)
+
+@instrument('get_prediction_for_ticker')
+def _get_prediction_for_ticker(ticker: str):
     print(f"--- Starting analysis for {ticker} ---")
     
     try:
@@ -69,8 +136,9 @@ def get_prediction_for_ticker(ticker: str):
         if unified_data.empty:
             raise ValueError("Failed to retrieve latest features.")
 
-        prediction_output = make_prediction(unified_data)
-        explanation_df = explain_prediction(unified_data)
+        # Single-row path without DataFrame validation; checked against make_prediction by bench_inference
+        prediction_output = make_fast_prediction(unified_data)
+        explanation_df = explain_prediction(unified_data, ticker=ticker)
         
         final_output = {
             "prediction": prediction_output['prediction'],
@@ -83,4 +151,80 @@ def get_prediction_for_ticker(ticker: str):
         
     except Exception as e:
         print(f"❌ An error occurred in the handler: {e}")
-        return None
\ No newline at end of file
+        return None
+
+@instrument()
+def predict_batch(tickers: list):
+    """
+    Scores many tickers at once by stacking their latest feature rows into one matrix.
+
+    Args:
+        tickers (list): The stock tickers to score.
+
+    Returns:
+        dict: Maps each ticker to its prediction, confidence, explanation and latest features.
+              Tickers whose features could not be loaded are left out.
+    """
+    print(f"--- Starting batch analysis for {len(tickers)} tickers ---")
+    start_time = time.perf_counter()
+
+    latest_rows = []
+    for ticker in tickers:
+        try:
+            latest_rows.append(get_latest_features(ticker).assign(ticker=ticker))
+        except Exception as e:
+            print(f"❌ Could not load features for {ticker}. Error: {e}")
+
+    if not latest_rows:
+        return {}
+
+    batch_df = pd.concat(latest_rows, ignore_index=True)
+    load_time = time.perf_counter()
+
+    # A single predict call and a single pred_contribs call for the whole watchlist
+    predictions = make_batch_prediction(batch_df)
+    explanations = explain_batch(batch_df)
+    score_time = time.perf_counter()
+
+    results = {}
+    for i, ticker in enumerate(batch_df['ticker']):
+        results[ticker] = {
+            "prediction": predictions[i]['prediction'],
+            "confidence": predictions[i]['confidence'],
+            "explanation": explanations[i],
+            "latest_features": batch_df.iloc[[i]].drop(columns='ticker')
+        }
+
+    scoring_seconds = score_time - load_time
+    print(f"Loaded features in {load_time - start_time:.3f}s, scored {len(batch_df)} tickers in {scoring_seconds:.3f}s "
+          f"({len(batch_df) / max(scoring_seconds, 1e-9):,.0f} tickers/s)")
+    print("--- Batch analysis complete ---")
+    return results
+
+def compare_batch_throughput(tickers: list):
+    """
+    Times predict_batch against the per-ticker get_prediction_for_ticker loop on the same tickers.
+    """
+    start_time = time.perf_counter()
+    for ticker in tickers:
+        get_prediction_for_ticker(ticker)
+    loop_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    predict_batch(tickers)
+    batch_seconds = time.perf_counter() - start_time
+
+    report = {
+        "tickers": len(tickers),
+        "loop_seconds": loop_seconds,
+        "batch_seconds": batch_seconds,
+        "loop_tickers_per_second": len(tickers) / max(loop_seconds, 1e-9),
+        "batch_tickers_per_second": len(tickers) / max(batch_seconds, 1e-9),
+        "speedup": loop_seconds / max(batch_seconds, 1e-9)
+    }
+    print(f"Per-ticker loop: {report['loop_tickers_per_second']:,.1f} tickers/s | "
+          f"Batch: {report['batch_tickers_per_second']:,.1f} tickers/s | Speedup: {report['speedup']:.1f}x")
+    return report
+
+if __name__ == '__main__':
+    compare_batch_throughput(["AAPL", "GOOGL", "MSFT"])
@@ -1,5 +1,7 @@
 # backend/main_pipeline.py
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -12,49 +14,183 @@ from backend.data_processing.get_news_data import fetch_news_articles
 from backend.data_processing.get_macro_data import fetch_fred_data # <-- NEW: Import macro function
 from backend.feature_engineering.build_fundamental_features import build_fundamental_features
 from backend.feature_engineering.build_technical_features import build_technical_features
-from backend.feature_engineering.build_sentiment_features import analyze_sentiment
-from backend.feature_engineering.unify_features import unify_features
-from backend.ml_models.train_model import train_model
-from backend.config.settings import RAW_DATA_DIR, PROCESSED_DATA_DIR, NEWS_API_KEY, FRED_API_KEY
+from backend.feature_engineering.build_sentiment_features import analyze_sentiment_batch
+from backend.feature_engineering.unify_features import refresh_master_datasets
+from backend.ml_models.train_panel import train_panel_model
+from backend.ml_models.walk_forward import run_walk_forward
+from backend.config.settings import RAW_DATA_DIR, NEWS_API_KEY, FRED_API_KEY, MACRO_SERIES, require_api_key
+from backend.utils.storage import dataset_path
+from backend.utils.locking import file_lock
+from backend.utils.instrumentation import instrument, start_run, end_run, write_run_report
 
-def run_full_pipeline(tickers: list):
+# --- Concurrency limits for the concurrent pipeline mode ---
+# Each data source gets its own cap so one slow or rate-limited API can't starve the others.
+SOURCE_CONCURRENCY = {
+    'fundamentals': 8,
+    'prices': 8,
+    'news': 4
+}
+FEATURE_WORKERS = 4
+
+@instrument()
+def collect_ticker_data(ticker: str):
+    """
+    Phase 1: Downloads the raw fundamentals, prices and news for one ticker.
+    """
+    # The same lock as on-demand generation, so the two never write a ticker's files at once
+    with file_lock(f"ticker_{ticker}"):
+        get_fundamental_data(ticker, dataset_path(RAW_DATA_DIR, f"fundamentals_{ticker}"))
+        get_price_data(ticker, dataset_path(RAW_DATA_DIR, f"price_{ticker}"))
+        fetch_news_articles(NEWS_API_KEY, ticker, dataset_path(RAW_DATA_DIR, f"news_{ticker}"))
+
+@instrument()
+def build_ticker_features(ticker: str):
+    """
+    Phase 2: Builds the fundamental and technical feature sets for one ticker.
+    Sentiment is scored for all tickers at once by analyze_sentiment_batch.
+    """
+    with file_lock(f"ticker_{ticker}"):
+        build_fundamental_features(ticker)
+        build_technical_features(ticker)
+
+def _run_limited(semaphore: threading.Semaphore, fetch_function, *args):
+    """
+    Runs a fetch function while holding its data source's concurrency slot.
+    """
+    with semaphore:
+        return fetch_function(*args)
+
+@instrument('collect_ticker_data')
+def _collect_ticker_data_limited(ticker: str, semaphores: dict):
+    """
+    Phase 1 for one ticker, with each source call throttled by its own semaphore.
+    """
+    with file_lock(f"ticker_{ticker}"):
+        _run_limited(semaphores['fundamentals'], get_fundamental_data, ticker, dataset_path(RAW_DATA_DIR, f"fundamentals_{ticker}"))
+        _run_limited(semaphores['prices'], get_price_data, ticker, dataset_path(RAW_DATA_DIR, f"price_{ticker}"))
+        _run_limited(semaphores['news'], fetch_news_articles, NEWS_API_KEY, ticker, dataset_path(RAW_DATA_DIR, f"news_{ticker}"))
+
+def _gather_in_order(tickers: list, futures: dict, stage: str, results: dict):
+    """
+    Waits on one future per ticker in input order, recording failures without stopping the run.
+    """
+    for ticker in tickers:
+        try:
+            futures[ticker].result()
+        except Exception as e:
+            print(f"❌ {stage} failed for {ticker}. Error: {e}")
+            results[ticker] = {'status': 'failed', 'stage': stage, 'error': str(e)}
+
+def run_concurrent_stages(tickers: list, io_workers: int = None, feature_workers: int = FEATURE_WORKERS):
+    """
+    Runs data collection on a thread pool and feature building on a process pool.
+    Sentiment is then scored in one batched pass over every ticker's news. New tickers are
+    then unified together in one panel pass, and existing ones are updated incrementally.
+
+    Args:
+        tickers (list): The stock tickers to process.
+        io_workers (int): Threads for the network-bound fetches. Defaults to the sum of the source limits.
+        feature_workers (int): Processes for the CPU-bound feature builders.
+
+    Returns:
+        dict: Maps each ticker, in input order, to its status ('ok' or 'failed') and any error.
+    """
+    results = {}
+    io_workers = io_workers or sum(SOURCE_CONCURRENCY.values())
+    semaphores = {source: threading.Semaphore(limit) for source, limit in SOURCE_CONCURRENCY.items()}
+
+    # Phase 1: Network-bound downloads on threads
+    print(f"\n--- Collecting data for {len(tickers)} tickers with {io_workers} threads ---")
+    with ThreadPoolExecutor(max_workers=io_workers) as executor:
+        futures = {ticker: executor.submit(_collect_ticker_data_limited, ticker, semaphores) for ticker in tickers}
+        _gather_in_order(tickers, futures, 'data collection', results)
+
+    # Phase 2: CPU-bound feature building fanned out across processes
+    ready_tickers = [ticker for ticker in tickers if ticker not in results]
+    print(f"\n--- Building features for {len(ready_tickers)} tickers with {feature_workers} processes ---")
+    with ProcessPoolExecutor(max_workers=feature_workers) as executor:
+        futures = {ticker: executor.submit(build_ticker_features, ticker) for ticker in ready_tickers}
+        _gather_in_order(ready_tickers, futures, 'feature building', results)
+
+        # Sentiment runs once in this process so FinBERT sees large batches and loads only once
+        ready_tickers = [ticker for ticker in tickers if ticker not in results]
+        print(f"\n--- Scoring sentiment for {len(ready_tickers)} tickers ---")
+        analyze_sentiment_batch(ready_tickers)
+
+    # Phase 3: Unification, only the affected tail of tickers that were built before
+    try:
+        unified = refresh_master_datasets(ready_tickers)
+        for ticker in ready_tickers:
+            if ticker not in unified:
+                results[ticker] = {'status': 'failed', 'stage': 'unification', 'error': 'no unified rows'}
+    except Exception as e:
+        print(f"❌ unification failed. Error: {e}")
+        for ticker in ready_tickers:
+            results[ticker] = {'status': 'failed', 'stage': 'unification', 'error': str(e)}
+
+    # Rebuild in input order so the summary is deterministic regardless of completion order
+    return {ticker: results.get(ticker, {'status': 'ok'}) for ticker in tickers}
+
+def run_full_pipeline(tickers: list, concurrent: bool = False):
     """
     Executes the entire data collection, feature engineering, and model training pipeline.
+    Writes a stage timing report for the run to REPORTS_DIR.
+
+    Args:
+        tickers (list): The stock tickers to process.
+        concurrent (bool): If True, fetch on a thread pool and build features on a process pool.
     """
+    run_id = start_run("pipeline")
+    try:
+        _run_pipeline_stages(tickers, concurrent)
+    finally:
+        end_run()
+        write_run_report(run_id)
+
+@instrument('run_full_pipeline')
+def _run_pipeline_stages(tickers: list, concurrent: bool):
     print("--- Starting Main Pipeline ---")
-    
+    # Fail fast before any work if the API keys are missing
+    require_api_key("FRED_API_KEY")
+    require_api_key("NEWS_API_KEY")
+
     # --- NEW: Fetch and save macro data once per run ---
     print("\n--- Processing Macroeconomic Data ---")
-    macro_series = {'DGS10': 'treasury_yield_10y', 'CPIAUCSL': 'cpi'}
-    fetch_fred_data(api_key=FRED_API_KEY, series_ids=macro_series, output_path=RAW_DATA_DIR / "macro_data.csv")
+    fetch_fred_data(api_key=FRED_API_KEY, series_ids=MACRO_SERIES, output_path=dataset_path(RAW_DATA_DIR, "macro_data"))
     # ---
 
-    for ticker in tickers:
-        print(f"\n--- Processing Ticker: {ticker} ---")
-        
-        # Phase 1: Data Collection
-        get_fundamental_data(ticker, RAW_DATA_DIR / f"fundamentals_{ticker}.csv")
-        get_price_data(ticker, RAW_DATA_DIR / f"price_{ticker}.csv")
-        fetch_news_articles(NEWS_API_KEY, ticker, RAW_DATA_DIR / f"news_{ticker}.csv")
-        
-        # Phase 2: Feature Engineering
-        build_fundamental_features(ticker)
-        build_technical_features(ticker)
-        analyze_sentiment(
-            RAW_DATA_DIR / f"news_{ticker}.csv", 
-            PROCESSED_DATA_DIR / f"sentiment_features_{ticker}.csv"
-        )
-        
-        # Phase 3: Unification
-        unify_features(ticker)
+    if concurrent:
+        ticker_status = run_concurrent_stages(tickers)
+        failed = [ticker for ticker, status in ticker_status.items() if status['status'] == 'failed']
+        if failed:
+            print(f"\n⚠️ {len(failed)} ticker(s) failed and were skipped: {', '.join(failed)}")
+    else:
+        for ticker in tickers:
+            print(f"\n--- Processing Ticker: {ticker} ---")
+            collect_ticker_data(ticker)
+            build_ticker_features(ticker)
+
+        # Phase 2b: One batched, deduplicated sentiment pass over every ticker's news
+        print("\n--- Scoring Sentiment for All Tickers ---")
+        analyze_sentiment_batch(tickers)
+
+        # Phase 3: Unification, only the affected tail of tickers that were built before
+        refresh_master_datasets(tickers)
 
     # Phase 4: Model Training
     if tickers:
-        print(f"\n--- Training Model on {tickers[0]} data ---")
-        train_model(tickers[0])
-    
+        print(f"\n--- Training Model on {len(tickers)} tickers ---")
+        train_panel_model(tickers)
+
+        # Phase 4b: Out-of-sample history for every ticker's dashboard chart
+        print("\n--- Walk-Forward Evaluation ---")
+        try:
+            run_walk_forward(tickers)
+        except Exception as e:
+            print(f"❌ walk-forward evaluation failed. Error: {e}")
+
     print("\n--- Main Pipeline Finished Successfully ---")
 
 if __name__ == '__main__':
-    stocks_to_track = ["AAPL", "GOOGL", "MSFT"] 
-    run_full_pipeline(stocks_to_track)
\ No newline at end of file
+    stocks_to_track = ["AAPL", "GOOGL", "MSFT"]
+    run_full_pipeline(stocks_to_track, concurrent="--concurrent" in sys.argv)
@@ -1,43 +1,124 @@
 # backend/ml_models/explain.py
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-import xgboost as xgb
-import shap
 from pathlib import Path
+import sys
 
-def explain_prediction(processed_data: pd.DataFrame):
-    print("DEBUG: `explain_prediction` (REAL) function was called.")
-    model_path = Path(__file__).parent.parent / "saved_models/meta_model_v1.json"
-    model = xgb.XGBClassifier()
-    model.load_model(model_path)
-    
-    # --- FIX: Define and select only the feature columns ---
-# In all three files: train_model.py, predict.py, and explain.py
-
-# --- USE THIS FINAL, COMPLETE FEATURE LIST ---
-    features = [
-        'RSI_14', 'MACD_12_26_9', 
-        'roe', 'roa', 'avg_sentiment',
-        'treasury_yield_10y', 'cpi' # <-- Add the new macro features
-    ]
-    data_for_explanation = processed_data[features]
-    # ---
-    
-    explainer = shap.TreeExplainer(model)
-    shap_values = explainer.shap_values(data_for_explanation)
-    
-    feature_names = data_for_explanation.columns
-    contributions = shap_values[0]
-    
-    explanation_df = pd.DataFrame({
-        'feature': feature_names,
-        'contribution': contributions
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.ml_models.model_registry import get_artifact, DEFAULT_MODEL_VERSION
+from backend.ml_models.feature_schema import project_features
+from backend.utils.instrumentation import instrument, add_counts
+
+# How many explained rows are kept in memory at once.
+MAX_CACHED_EXPLANATIONS = 4096
+
+# (model version, ticker, feature-row hash) -> contribution vector, least to most recently used
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def compute_contributions(X: np.ndarray, artifact: dict, interactions: bool = False) -> np.ndarray:
+    """
+    Computes exact TreeSHAP attributions with XGBoost's native pred_contribs, without shap.
+
+    Args:
+        X (np.ndarray): The projected feature matrix (see feature_schema.project_features).
+        artifact (dict): The registry artifact holding the booster and manifest.
+        interactions (bool): Return pairwise SHAP interaction values instead (pred_interactions).
+
+    Returns:
+        np.ndarray: (rows, features) contributions in log-odds, or (rows, features, features)
+                    interactions. The bias column is dropped.
+    """
+    import xgboost as xgb
+    dmatrix = xgb.DMatrix(X, feature_names=artifact['manifest']['features'])
+    if interactions:
+        return artifact['model'].predict(dmatrix, pred_interactions=True)[:, :-1, :-1]
+    return artifact['model'].predict(dmatrix, pred_contribs=True)[:, :-1]
+
+def _row_key(version: str, ticker, row: np.ndarray) -> tuple:
+    return version, ticker, hashlib.sha1(row.tobytes()).hexdigest()
+
+def explain_matrix(processed_data: pd.DataFrame, model_version: str = DEFAULT_MODEL_VERSION,
+                   tickers: list = None) -> pd.DataFrame:
+    """
+    Explains many feature rows as one contribution matrix, computing only the rows not already cached.
+
+    Args:
+        processed_data (pd.DataFrame): One row per item to explain, containing the model features.
+        model_version (str): The model version to load from the registry.
+        tickers (list): The ticker of each row, for the cache key. Defaults to the 'ticker'
+                        column if there is one.
+
+    Returns:
+        pd.DataFrame: One row per input row (same index) and one column per model feature.
+    """
+    artifact = get_artifact(model_version)
+    features = artifact['manifest']['features']
+    X = project_features(processed_data, artifact['manifest'])
+    if tickers is None:
+        tickers = processed_data['ticker'].tolist() if 'ticker' in processed_data.columns else [None] * len(X)
+
+    keys = [_row_key(artifact['version'], ticker, row) for ticker, row in zip(tickers, X)]
+    contributions = np.empty(X.shape, dtype=np.float32)
+    with _cache_lock:
+        missing = []
+        for position, key in enumerate(keys):
+            cached = _cache.get(key)
+            if cached is None:
+                missing.append(position)
+            else:
+                _cache.move_to_end(key)
+                contributions[position] = cached
+    add_counts(cache_hits=len(keys) - len(missing), cache_misses=len(missing))
+
+    if missing:
+        # One pred_contribs call for every uncached row
+        contributions[missing] = compute_contributions(X[missing], artifact)
+        with _cache_lock:
+            for position in missing:
+                _cache[keys[position]] = contributions[position].copy()
+            while len(_cache) > MAX_CACHED_EXPLANATIONS:
+                _cache.popitem(last=False)
+
+    return pd.DataFrame(contributions, index=processed_data.index, columns=features)
+
+def _to_explanation_frame(row_contributions: pd.Series) -> pd.DataFrame:
+    # The feature/contribution frame display_prediction_and_drivers renders
+    return pd.DataFrame({
+        'feature': row_contributions.index,
+        'contribution': row_contributions.to_numpy()
     }).sort_values(by='contribution', ascending=False)
-    
-    # (in the explain_prediction function)
-# ...
-    # --- USE THIS UPDATED FEATURE LIST ---
-    features = ['RSI_14', 'MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9', 'roe', 'roa', 'avg_sentiment']
-    data_for_explanation = processed_data[features]
-# ...
-
-    return explanation_df
\ No newline at end of file
+
+@instrument()
+def explain_prediction(processed_data: pd.DataFrame, model_version: str = DEFAULT_MODEL_VERSION, ticker: str = None):
+    print("DEBUG: `explain_prediction` (REAL) function was called.")
+    # Repeated views of the same ticker and row are served from the explanation cache
+    contributions = explain_matrix(processed_data.iloc[:1], model_version,
+                                   tickers=[ticker] if ticker is not None else None)
+    return _to_explanation_frame(contributions.iloc[0])
+
+@instrument()
+def explain_batch(processed_data: pd.DataFrame, model_version: str = DEFAULT_MODEL_VERSION):
+    """
+    Explains many feature rows with a single pred_contribs call.
+
+    Args:
+        processed_data (pd.DataFrame): One row per item to explain, containing the model features.
+        model_version (str): The model version to load from the registry.
+
+    Returns:
+        list: One explanation DataFrame (feature/contribution) per input row, in input order.
+              explain_matrix returns the same values as one matrix.
+    """
+    contributions = explain_matrix(processed_data, model_version)
+    return [_to_explanation_frame(row_contributions) for _, row_contributions in contributions.iterrows()]
+
+def clear_explanation_cache():
+    """
+    Drops every cached explanation.
+    """
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,81 @@
+# backend/ml_models/fast_inference.py
+import threading
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.ml_models.model_registry import get_artifact, DEFAULT_MODEL_VERSION
+
+# One preallocated (1, n_features) input row per thread and feature count, reused by every call
+_local = threading.local()
+
+def _row_buffer(n_features: int) -> np.ndarray:
+    buffers = getattr(_local, 'buffers', None)
+    if buffers is None:
+        buffers = _local.buffers = {}
+    buffer = buffers.get(n_features)
+    if buffer is None:
+        buffer = buffers[n_features] = np.empty((1, n_features), dtype=np.float32)
+    return buffer
+
+def _fill_row(buffer: np.ndarray, row, features: list):
+    """
+    Copies one row's feature values into the buffer, in the model's feature order.
+    """
+    if isinstance(row, pd.DataFrame):
+        if len(row) != 1:
+            raise ValueError(f"Expected a single row, got {len(row)}.")
+        try:
+            for position, feature in enumerate(features):
+                buffer[0, position] = row[feature].iat[0]
+        except KeyError:
+            raise ValueError(f"Input is missing model features: {[f for f in features if f not in row.columns]}")
+    elif isinstance(row, (dict, pd.Series)):
+        try:
+            for position, feature in enumerate(features):
+                buffer[0, position] = row[feature]
+        except KeyError:
+            raise ValueError(f"Input is missing model features: {[f for f in features if f not in row]}")
+    else:
+        # Already a sequence of values in the model's feature order
+        if len(row) != len(features):
+            raise ValueError(f"Expected {len(features)} feature values, got {len(row)}.")
+        buffer[0, :] = row
+
+def _score(artifact: dict, row) -> float:
+    features = artifact['manifest']['features']
+    buffer = _row_buffer(len(features))
+    _fill_row(buffer, row, features)
+    return float(artifact['model'].inplace_predict(buffer)[0])
+
+def predict_proba_fast(row, model_version: str = DEFAULT_MODEL_VERSION) -> float:
+    """
+    Returns the bullish probability of a single row, skipping the DataFrame machinery of make_prediction.
+
+    The row's values are written into a preallocated float32 row and scored with the booster's
+    inplace_predict, so no DMatrix or intermediate frame is built per call.
+
+    Args:
+        row: A one-row DataFrame, a dict or Series keyed by feature name, or a sequence of values
+             in the model's feature order.
+        model_version (str): The model version to load from the registry.
+
+    Returns:
+        float: The probability of the positive (bullish) class.
+    """
+    return _score(get_artifact(model_version), row)
+
+def make_fast_prediction(processed_data, model_version: str = DEFAULT_MODEL_VERSION) -> dict:
+    """
+    Single-row equivalent of make_prediction with the same output, built on predict_proba_fast.
+    """
+    artifact = get_artifact(model_version)
+    confidence = _score(artifact, processed_data)
+    return {
+        'prediction': 'Bullish' if confidence > 0.5 else 'Bearish',
+        'confidence': confidence,
+        'model_version': artifact['version']
+    }
@@ -0,0 +1,59 @@
+# backend/ml_models/feature_schema.py
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# The one feature list shared by training, tuning, prediction and explanation.
+# Saved models carry their own copy in their manifest, so changing it never breaks a saved model.
+MODEL_FEATURES = [
+    'RSI_14', 'MACD_12_26_9',
+    'roe', 'roa', 'avg_sentiment',
+    'treasury_yield_10y', 'cpi'
+]
+FEATURE_DTYPE = 'float32'
+
+def build_manifest(features: list = MODEL_FEATURES) -> dict:
+    """
+    Returns the feature schema stored in a model's manifest: the ordered feature names and their dtypes.
+    """
+    return {'features': list(features), 'dtypes': {feature: FEATURE_DTYPE for feature in features}}
+
+def project_features(processed_data: pd.DataFrame, manifest: dict) -> np.ndarray:
+    """
+    Validates a frame against a model's feature schema and projects it to the model's input matrix.
+
+    Columns are looked up in one pass and converted in one copy, in the order the model was
+    trained on; extra columns are ignored.
+
+    Args:
+        processed_data (pd.DataFrame): Rows to score, containing at least the manifest's features.
+        manifest (dict): The model manifest (or build_manifest() for legacy models).
+
+    Returns:
+        np.ndarray: A (rows, features) matrix of the manifest's dtype.
+
+    Raises:
+        ValueError: If any of the model's features is missing.
+    """
+    features = manifest['features']
+    positions = processed_data.columns.get_indexer(features)
+    if (positions < 0).any():
+        missing = [feature for feature, position in zip(features, positions) if position < 0]
+        raise ValueError(f"Input is missing model features: {missing}")
+    dtype = np.result_type(*manifest['dtypes'].values())
+    return processed_data.iloc[:, positions].to_numpy(dtype=dtype)
+
+def update_data_hash(hasher, df: pd.DataFrame):
+    """
+    Adds a frame's rows to a running hashlib digest, for hashing data that is streamed in batches.
+    """
+    hasher.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Returns a content hash of a frame's rows, recorded in the manifest to identify the training data.
+    """
+    hasher = hashlib.sha256()
+    update_data_hash(hasher, df)
+    return hasher.hexdigest()
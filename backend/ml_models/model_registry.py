@@ -0,0 +1,259 @@
+# backend/ml_models/model_registry.py
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import MODELS_DIR
+from backend.utils.storage import write_json
+from backend.ml_models.feature_schema import build_manifest
+
+# Alias for the promoted version named in the pointer file. Resolved on every call,
+# so serving switches to a newly promoted version without a restart.
+DEFAULT_MODEL_VERSION = "latest"
+# The single model file saved before versioned bundles, served until a bundle is promoted
+LEGACY_MODEL_VERSION = "v1"
+
+# How many model versions are kept warm in memory at once.
+MAX_LOADED_VERSIONS = 3
+
+# version -> {'version', 'path', 'mtime', 'model', 'manifest'}, least to most recently used
+_registry = OrderedDict()
+_registry_lock = threading.RLock()
+# The promoted version as last read from the pointer file, and the file's mtime at that read
+_current = {'version': None, 'mtime': None}
+
+
+def get_pointer_path() -> Path:
+    """
+    Returns the path of the file naming the promoted model version.
+    """
+    return MODELS_DIR / "latest.json"
+
+
+def get_bundle_dir(version: str) -> Path:
+    """
+    Returns the directory of a versioned artifact bundle (model.json + manifest.json).
+    """
+    return MODELS_DIR / version
+
+
+def get_model_path(version: str = DEFAULT_MODEL_VERSION) -> Path:
+    """
+    Returns the path of the saved model file for a given version.
+    """
+    version = resolve_version(version)
+    bundle_model_path = get_bundle_dir(version) / "model.json"
+    if bundle_model_path.exists():
+        return bundle_model_path
+    return MODELS_DIR / f"meta_model_{version}.json"
+
+
+def get_params_path(version: str = DEFAULT_MODEL_VERSION) -> Path:
+    """
+    Returns the path of the tuned training parameters for a given version.
+    """
+    return MODELS_DIR / f"best_params_{version}.json"
+
+
+def resolve_version(version: str = DEFAULT_MODEL_VERSION) -> str:
+    """
+    Turns the DEFAULT_MODEL_VERSION alias into the promoted version; other versions are returned as is.
+    """
+    if version != DEFAULT_MODEL_VERSION:
+        return version
+    pointer_path = get_pointer_path()
+    with _registry_lock:
+        try:
+            mtime = pointer_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return _current['version'] or LEGACY_MODEL_VERSION
+        # Re-read only when another process (or this one) has promoted a version since the last read
+        if mtime != _current['mtime']:
+            with open(pointer_path) as f:
+                _current['version'] = json.load(f)['version']
+            _current['mtime'] = mtime
+        return _current['version']
+
+
+def list_versions() -> list:
+    """
+    Returns the versions of every saved artifact bundle, oldest first.
+    """
+    if not MODELS_DIR.exists():
+        return []
+    return sorted(path.name for path in MODELS_DIR.iterdir() if (path / "manifest.json").exists())
+
+
+def save_artifact(booster, manifest: dict, metrics: dict, data_hash: str, version: str = None,
+                  promote: bool = True) -> str:
+    """
+    Saves a trained booster as a new, immutable artifact bundle and optionally promotes it.
+
+    The bundle is written to a temporary directory and renamed into place, so a version
+    directory either holds a complete bundle or doesn't exist.
+
+    Args:
+        booster (xgb.Booster): The trained model.
+        manifest (dict): The feature schema from feature_schema.build_manifest.
+        metrics (dict): Validation metrics to record with the model.
+        data_hash (str): Hash of the training data.
+        version (str): The version name. Defaults to a unique UTC timestamp.
+        promote (bool): Make it the version served under DEFAULT_MODEL_VERSION.
+
+    Returns:
+        str: The saved version.
+    """
+    import xgboost as xgb
+
+    if version is None:
+        # Microseconds keep trainings that finish in the same second apart; the counter covers the rest
+        base_version = datetime.now(timezone.utc).strftime("v%Y%m%d%H%M%S%f")
+        version, suffix = base_version, 1
+        while get_bundle_dir(version).exists():
+            version, suffix = f"{base_version}_{suffix}", suffix + 1
+    bundle_dir = get_bundle_dir(version)
+    if bundle_dir.exists():
+        raise FileExistsError(f"Model version '{version}' already exists at {bundle_dir}")
+
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=MODELS_DIR, prefix=f".{version}."))
+    try:
+        booster.save_model(tmp_dir / "model.json")
+        write_json({
+            'version': version,
+            **manifest,
+            'data_hash': data_hash,
+            'metrics': metrics,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'xgboost_version': xgb.__version__,
+        }, tmp_dir / "manifest.json", indent=2)
+        os.replace(tmp_dir, bundle_dir)
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+
+    print(f"✅ Saved model {version} to {bundle_dir}")
+    if promote:
+        promote_version(version)
+    return version
+
+
+def promote_version(version: str):
+    """
+    Makes a saved version the one served under DEFAULT_MODEL_VERSION.
+
+    The version is loaded before the switch, so the first request after it doesn't pay for
+    the load, and the pointer file is replaced atomically: readers in every process see either
+    the old version or the new one.
+    """
+    _get_entry(version)
+    write_json({'version': version, 'promoted_at': datetime.now(timezone.utc).isoformat()}, get_pointer_path())
+    with _registry_lock:
+        _current['version'] = version
+        _current['mtime'] = get_pointer_path().stat().st_mtime_ns
+    print(f"✅ Promoted model {version}")
+
+
+def preload(versions: list = None):
+    """
+    Loads model versions into the registry ahead of traffic. Defaults to the promoted version.
+    """
+    for version in versions or [DEFAULT_MODEL_VERSION]:
+        _get_entry(version)
+
+
+def _load_entry(version: str):
+    """
+    Loads a model version from disk into a fresh registry entry.
+    """
+    model_path = get_model_path(version)
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model file for version '{version}' not found at {model_path}")
+
+    import xgboost as xgb
+
+    manifest_path = model_path.parent / "manifest.json"
+    if model_path.name == "model.json" and manifest_path.exists():
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    else:
+        # Legacy single-file model, trained on the shared feature list
+        manifest = build_manifest()
+
+    mtime = model_path.stat().st_mtime
+    model = xgb.Booster()
+    model.load_model(model_path)
+    print(f"✅ Loaded model {version} from {model_path}")
+    return {'version': version, 'path': model_path, 'mtime': mtime, 'model': model, 'manifest': manifest}
+
+
+def _get_entry(version: str):
+    """
+    Returns the warm registry entry for a version, loading or hot-reloading it when needed.
+    """
+    with _registry_lock:
+        version = resolve_version(version)
+        entry = _registry.get(version)
+
+        # Hot-reload when the file on disk has changed since it was loaded (e.g. a retrained legacy model)
+        if entry is not None:
+            try:
+                current_mtime = entry['path'].stat().st_mtime
+            except FileNotFoundError:
+                current_mtime = None
+            if current_mtime != entry['mtime']:
+                print(f"Model file for {version} changed on disk. Reloading...")
+                entry = None
+
+        if entry is None:
+            entry = _load_entry(version)
+            _registry[version] = entry
+
+        # Mark as most recently used and evict the least recently used versions
+        _registry.move_to_end(version)
+        while len(_registry) > MAX_LOADED_VERSIONS:
+            evicted_version, _ = _registry.popitem(last=False)
+            print(f"Evicted model {evicted_version} from the registry.")
+
+        return entry
+
+
+def get_artifact(version: str = DEFAULT_MODEL_VERSION) -> dict:
+    """
+    Returns the loaded registry entry for a version: its 'version', 'model' (xgb.Booster) and
+    'manifest'. Use it when the model and its feature schema must come from the same version.
+    """
+    return _get_entry(version)
+
+
+def get_model(version: str = DEFAULT_MODEL_VERSION):
+    """
+    Returns the shared, already-loaded booster for a model version.
+    """
+    return _get_entry(version)['model']
+
+
+def clear_registry():
+    """
+    Drops every loaded model version, forcing the next call to reload from disk.
+    """
+    with _registry_lock:
+        _registry.clear()
+        _current['version'] = None
+        _current['mtime'] = None
+
+
+if __name__ == '__main__':
+    # python backend/ml_models/model_registry.py [version-to-promote]
+    if len(sys.argv) > 1:
+        promote_version(sys.argv[1])
+    print(f"Promoted: {resolve_version()}")
+    for saved_version in list_versions():
+        print(f"  {saved_version}")
@@ -1,40 +1,52 @@
 # backend/ml_models/predict.py
-import xgboost as xgb
 import pandas as pd
 from pathlib import Path
+import sys
 
-def make_prediction(processed_data: pd.DataFrame):
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.ml_models.model_registry import get_artifact, DEFAULT_MODEL_VERSION
+from backend.ml_models.feature_schema import project_features
+from backend.utils.instrumentation import instrument
+
+@instrument()
+def make_prediction(processed_data: pd.DataFrame, model_version: str = DEFAULT_MODEL_VERSION):
     print("DEBUG: `make_prediction` (REAL) function was called.")
-    model_path = Path(__file__).parent.parent / "saved_models/meta_model_v1.json"
-    model = xgb.XGBClassifier()
-    model.load_model(model_path)
-    
-    # --- FIX: Define and select only the feature columns ---
-# In all three files: train_model.py, predict.py, and explain.py
-
-# --- USE THIS FINAL, COMPLETE FEATURE LIST ---
-    features = [
-        'RSI_14', 'MACD_12_26_9', 
-        'roe', 'roa', 'avg_sentiment',
-        'treasury_yield_10y', 'cpi' # <-- Add the new macro features
-    ]
-    data_for_prediction = processed_data[features]
-    # ---
-    
-    prediction_proba = model.predict_proba(data_for_prediction)
-    
-    confidence = prediction_proba[0][1]
+    # The model is loaded once per process and shared through the registry
+    artifact = get_artifact(model_version)
+
+    # Validated against the model's own feature schema and projected in one step
+    data_for_prediction = project_features(processed_data, artifact['manifest'])
+    confidence = float(artifact['model'].inplace_predict(data_for_prediction)[0])
     prediction = 'Bullish' if confidence > 0.5 else 'Bearish'
-    
-    # (in the make_prediction function)
-# ...
-    # --- USE THIS UPDATED FEATURE LIST ---
-    features = ['RSI_14', 'MACD_12_26_9', 'MACDh_12_26_9', 'MACDs_12_26_9', 'roe', 'roa', 'avg_sentiment']
-    data_for_prediction = processed_data[features]
-# ...
 
     return {
         'prediction': prediction,
         'confidence': confidence,
-        'model_version': 'v1.0-real'
-    }
\ No newline at end of file
+        'model_version': artifact['version']
+    }
+
+@instrument()
+def make_batch_prediction(processed_data: pd.DataFrame, model_version: str = DEFAULT_MODEL_VERSION):
+    """
+    Scores many feature rows (e.g. the latest row of every ticker) with a single predict call.
+
+    Args:
+        processed_data (pd.DataFrame): One row per item to score, containing the model features.
+        model_version (str): The model version to load from the registry.
+
+    Returns:
+        list: One prediction dict per input row, in the same order as the input.
+    """
+    artifact = get_artifact(model_version)
+
+    # One vectorized call for the whole matrix instead of one call per row
+    confidences = artifact['model'].inplace_predict(project_features(processed_data, artifact['manifest']))
+
+    return [
+        {
+            'prediction': 'Bullish' if confidence > 0.5 else 'Bearish',
+            'confidence': float(confidence),
+            'model_version': artifact['version']
+        }
+        for confidence in confidences
+    ]
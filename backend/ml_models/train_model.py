@@ -1,30 +1,30 @@
 # backend/ml_models/train_model.py
 import pandas as pd
-import xgboost as xgb
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
 from pathlib import Path
 import sys
 import numpy as np
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from backend.config.settings import PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame, write_frame
+from backend.ml_models.model_registry import save_artifact
+from backend.ml_models.feature_schema import MODEL_FEATURES, build_manifest, hash_frame
+from backend.utils.instrumentation import instrument
 
+@instrument()
 def train_model(ticker: str):
     """
-    Trains a balanced model and saves it, then generates and saves historical predictions.
+    Trains a balanced model and saves it as a new promoted model version, then generates and
+    saves historical predictions.
     """
+    import xgboost as xgb
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+
     print(f"Training model for {ticker}...")
-    master_df = pd.read_csv(PROCESSED_DATA_DIR / f"master_dataset_{ticker}.csv", parse_dates=['date'])
+    master_df = read_frame(dataset_path(PROCESSED_DATA_DIR, f"master_dataset_{ticker}"))
     
-    # In all three files: train_model.py, predict.py, and explain.py
-
-# --- USE THIS FINAL, COMPLETE FEATURE LIST ---
-    features = [
-        'RSI_14', 'MACD_12_26_9', 
-        'roe', 'roa', 'avg_sentiment',
-        'treasury_yield_10y', 'cpi' # <-- Add the new macro features
-    ]
+    features = MODEL_FEATURES
     master_df = master_df.dropna(subset=features)
 
     X = master_df[features]
@@ -55,18 +55,16 @@ def train_model(ticker: str):
     
     model.fit(X_train, y_train)
     
-    model_path = Path(__file__).parent.parent / "saved_models/meta_model_v1.json"
-    model_path.parent.mkdir(exist_ok=True)
-    model.save_model(model_path)
-    
     y_pred = model.predict(X_test)
     acc = accuracy_score(y_test, y_pred)
     print(f"✅ Model trained with accuracy: {acc:.2%}")
-    print(f"Model saved to {model_path}")
+
+    save_artifact(model.get_booster(), build_manifest(features), metrics={'accuracy': float(acc)},
+                  data_hash=hash_frame(master_df[features + ['target']]))
 
     historical_predictions_df = pd.DataFrame({'date': dates_test, 'prediction': y_pred})
-    hist_pred_path = PROCESSED_DATA_DIR / f"historical_predictions_{ticker}.csv"
-    historical_predictions_df.to_csv(hist_pred_path, index=False)
+    hist_pred_path = dataset_path(PROCESSED_DATA_DIR, f"historical_predictions_{ticker}")
+    write_frame(historical_predictions_df, hist_pred_path)
     print(f"✅ Historical predictions saved to {hist_pred_path}")
 
 if __name__ == '__main__':
@@ -0,0 +1,172 @@
+# backend/ml_models/train_panel.py
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import PROCESSED_DATA_DIR, CACHE_DIR
+from backend.utils.storage import dataset_path, read_frame
+from backend.utils.instrumentation import instrument
+from backend.feature_engineering.unify_features import TARGET_HORIZON
+from backend.ml_models.model_registry import save_artifact
+from backend.ml_models.feature_schema import MODEL_FEATURES, build_manifest, update_data_hash
+from backend.ml_models.tune_model import load_tuned_config
+
+# Master files are grouped into batches of about this many rows. Only one batch is held in
+# memory at a time; XGBoost keeps the quantized pages on disk between boosting rounds.
+BATCH_ROWS = 500_000
+# The most recent trading year across the panel is held out for validation
+VALIDATION_DAYS = 365
+NUM_BOOST_ROUNDS = 300
+EARLY_STOPPING_ROUNDS = 20
+
+def master_dataset_paths(tickers: list = None) -> list:
+    """
+    Returns the master dataset files of the given tickers, or of every ticker on disk.
+    """
+    if tickers is not None:
+        paths = [dataset_path(PROCESSED_DATA_DIR, f"master_dataset_{ticker}") for ticker in tickers]
+        return [path for path in paths if path.exists()]
+    suffix = dataset_path(PROCESSED_DATA_DIR, "master_dataset_x").suffix
+    return sorted(Path(PROCESSED_DATA_DIR).glob(f"master_dataset_*{suffix}"))
+
+def _split_dates(paths: list, embargo: int = TARGET_HORIZON) -> tuple:
+    """
+    Picks the validation start (VALIDATION_DAYS before the panel's last date) and the training end,
+    `embargo` trading days earlier: the targets of the rows in between look into the validation block.
+
+    Returns:
+        tuple: (train_end, valid_start) dates. Training rows are before train_end, validation rows from valid_start on.
+    """
+    # One date column at a time, so this pass stays small however many tickers there are
+    unique_dates = np.unique(np.concatenate([
+        read_frame(path, columns=['date'])['date'].dropna().to_numpy(dtype='datetime64[ns]') for path in paths
+    ]))
+    valid_start = pd.Timestamp(unique_dates[-1]) - pd.Timedelta(days=VALIDATION_DAYS)
+    train_end_day = int(np.searchsorted(unique_dates, np.datetime64(valid_start, 'ns'), side='left')) - embargo
+    if train_end_day <= 0:
+        raise ValueError("Not enough history for a validation period.")
+    return pd.Timestamp(unique_dates[train_end_day]), valid_start
+
+def _make_iterator(paths: list, filters: list, cache_prefix: str, stats: dict):
+    """
+    Builds an xgb.DataIter that streams the master files in BATCH_ROWS-sized batches.
+    Class counts (for scale_pos_weight) and the data hash are collected on the first pass.
+    """
+    import xgboost as xgb
+
+    class MasterDatasetIter(xgb.DataIter):
+        def __init__(self):
+            self._position = 0
+            self._first_pass = True
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data) -> int:
+            frames, rows = [], 0
+            while self._position < len(paths) and rows < BATCH_ROWS:
+                df = read_frame(paths[self._position], columns=MODEL_FEATURES + ['target'], filters=filters)
+                self._position += 1
+                df = df.dropna(subset=MODEL_FEATURES)
+                if not df.empty:
+                    frames.append(df)
+                    rows += len(df)
+            if not frames:
+                return 0
+
+            batch = pd.concat(frames, ignore_index=True)
+            if self._first_pass:
+                positives = int(batch['target'].sum())
+                stats['positive'] += positives
+                stats['negative'] += len(batch) - positives
+                update_data_hash(stats['hasher'], batch)
+            input_data(data=batch[MODEL_FEATURES].astype(np.float32), label=batch['target'].to_numpy(dtype=np.float32))
+            return 1
+
+        def reset(self):
+            if self._position > 0:
+                self._first_pass = False
+            self._position = 0
+
+    return MasterDatasetIter()
+
+@instrument()
+def train_panel_model(tickers: list = None, nthread: int = None, model_version: str = None, promote: bool = True) -> dict:
+    """
+    Trains one model on the master datasets of many tickers and saves it as a new model version.
+
+    The files are streamed through an external-memory DMatrix, so peak memory is bounded by
+    one batch plus XGBoost's page cache rather than by the size of the universe. The features
+    are the same as for single-ticker models, so the saved model serves any ticker.
+
+    Args:
+        tickers (list): The tickers to train on. Defaults to every master dataset on disk.
+        nthread (int): XGBoost threads. Defaults to the CPU count.
+        model_version (str): The version name to save. Defaults to a timestamp.
+        promote (bool): Serve the new version under DEFAULT_MODEL_VERSION.
+
+    Returns:
+        dict: The saved version, row counts, validation metrics, the best iteration and the training time.
+    """
+    import xgboost as xgb
+
+    start = time.perf_counter()
+    paths = master_dataset_paths(tickers)
+    if not paths:
+        raise FileNotFoundError("No master datasets found to train on.")
+
+    train_end, valid_start = _split_dates(paths)
+    print(f"Training panel model on {len(paths)} tickers up to {train_end.date()}, "
+          f"validating from {valid_start.date()} on...")
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=CACHE_DIR, prefix="xgb_panel_") as cache_dir:
+        train_stats = {'positive': 0, 'negative': 0, 'hasher': hashlib.sha256()}
+        valid_stats = {'positive': 0, 'negative': 0, 'hasher': hashlib.sha256()}
+        dtrain = xgb.DMatrix(_make_iterator(paths, [('date', '<', train_end)], os.path.join(cache_dir, "train"), train_stats),
+                             nthread=nthread or -1)
+        dvalid = xgb.DMatrix(_make_iterator(paths, [('date', '>=', valid_start)], os.path.join(cache_dir, "valid"), valid_stats),
+                             nthread=nthread or -1)
+
+        # Parameters and boosting budget found by tune_model, if it has been run
+        tuned = load_tuned_config()
+        params = {
+            **tuned.get('params', {}),
+            'objective': 'binary:logistic',
+            'eval_metric': ['logloss', 'error'],
+            'tree_method': 'hist',
+            'nthread': nthread or os.cpu_count() or 1,
+            'scale_pos_weight': train_stats['negative'] / train_stats['positive'] if train_stats['positive'] else 1,
+        }
+        evals_result = {}
+        booster = xgb.train(
+            params, dtrain, num_boost_round=tuned.get('num_boost_round', NUM_BOOST_ROUNDS),
+            evals=[(dvalid, 'valid')], evals_result=evals_result,
+            early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False
+        )
+
+    best = booster.best_iteration
+    report = {
+        'tickers': len(paths),
+        'train_rows': train_stats['positive'] + train_stats['negative'],
+        'valid_rows': valid_stats['positive'] + valid_stats['negative'],
+        'valid_logloss': evals_result['valid']['logloss'][best],
+        'valid_accuracy': 1 - evals_result['valid']['error'][best],
+        'best_iteration': best,
+        'seconds': time.perf_counter() - start,
+    }
+    metrics = {key: report[key] for key in ('train_rows', 'valid_rows', 'valid_logloss', 'valid_accuracy', 'best_iteration')}
+    # Only the trees up to the best validation round are served
+    report['version'] = save_artifact(booster[:best + 1], build_manifest(), metrics, train_stats['hasher'].hexdigest(),
+                                      version=model_version, promote=promote)
+    print(f"✅ Panel model trained on {report['train_rows']:,} rows: validation accuracy {report['valid_accuracy']:.2%}, "
+          f"logloss {report['valid_logloss']:.4f} ({report['seconds']:.1f}s)")
+    return report
+
+if __name__ == '__main__':
+    train_panel_model(sys.argv[1:] or None)
@@ -0,0 +1,188 @@
+# backend/ml_models/tune_model.py
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import REPORTS_DIR
+from backend.utils.storage import dataset_path, write_frame, write_json
+from backend.utils.instrumentation import instrument
+from backend.feature_engineering.unify_features import TARGET_HORIZON
+from backend.ml_models.model_registry import get_params_path, DEFAULT_MODEL_VERSION
+from backend.ml_models.feature_schema import MODEL_FEATURES
+from backend.ml_models.walk_forward import BASE_PARAMS, load_training_panel
+
+DEFAULT_TRIALS = 27
+# Boosting-round budgets of the successive-halving rungs. After each rung only the best
+# 1/HALVING_RATE of the trials move on to the next, larger budget.
+RUNG_BUDGETS = [50, 150, 450]
+HALVING_RATE = 3
+EARLY_STOPPING_ROUNDS = 20
+# Share of the trading days, at the end of the panel, used as the validation fold
+VALIDATION_FRACTION = 0.2
+
+# Set once per worker process by _init_worker: the train and validation DMatrix
+_shared = {}
+
+def sample_params(rng: np.random.Generator) -> dict:
+    """
+    Draws one random configuration from the search space.
+    """
+    return {
+        'max_depth': int(rng.integers(3, 10)),
+        'learning_rate': float(10 ** rng.uniform(-2.5, -0.5)),
+        'subsample': float(rng.uniform(0.5, 1.0)),
+        'colsample_bytree': float(rng.uniform(0.5, 1.0)),
+        'min_child_weight': float(10 ** rng.uniform(0, 1.5)),
+        'reg_lambda': float(10 ** rng.uniform(-1, 1.5)),
+        'gamma': float(rng.uniform(0, 5)),
+    }
+
+def _init_worker(X_train: np.ndarray, y_train: np.ndarray, X_valid: np.ndarray, y_valid: np.ndarray, nthread: int):
+    """
+    Builds the train and validation DMatrix once per process, so trials don't re-convert them.
+    """
+    import xgboost as xgb
+    _shared['dtrain'] = xgb.DMatrix(X_train, label=y_train, feature_names=MODEL_FEATURES, nthread=nthread)
+    _shared['dvalid'] = xgb.DMatrix(X_valid, label=y_valid, feature_names=MODEL_FEATURES, nthread=nthread)
+    _shared['nthread'] = nthread
+    positives = np.sum(y_train == 1)
+    _shared['scale_pos_weight'] = float(np.sum(y_train == 0) / positives) if positives else 1.0
+
+def _run_trial(trial_id: int, params: dict, num_rounds: int) -> dict:
+    """
+    Trains one configuration with a budget of num_rounds, stopping early on the validation fold.
+    """
+    import xgboost as xgb
+    start = time.perf_counter()
+    trial_params = dict(BASE_PARAMS, **params, nthread=_shared['nthread'],
+                        scale_pos_weight=_shared['scale_pos_weight'], eval_metric=['error', 'logloss'])
+    evals_result = {}
+    booster = xgb.train(trial_params, _shared['dtrain'], num_boost_round=num_rounds,
+                        evals=[(_shared['dvalid'], 'valid')], evals_result=evals_result,
+                        early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False)
+    best = booster.best_iteration
+    return {
+        'trial': trial_id,
+        'budget': num_rounds,
+        'best_iteration': best,
+        # Stopped before using its budget: a larger budget would give the same model
+        'converged': best + EARLY_STOPPING_ROUNDS < num_rounds,
+        'valid_logloss': evals_result['valid']['logloss'][best],
+        'valid_accuracy': 1 - evals_result['valid']['error'][best],
+        'seconds': time.perf_counter() - start,
+    }
+
+def split_validation(dates: np.ndarray, fraction: float = VALIDATION_FRACTION, embargo: int = TARGET_HORIZON) -> tuple:
+    """
+    Splits date-sorted rows into a training block and a later validation block. The last `embargo`
+    days before the validation block are dropped, since their targets look into it.
+
+    Returns:
+        tuple: (train_end, valid_start) row positions.
+    """
+    unique_dates = np.unique(dates)
+    valid_start_day = int(len(unique_dates) * (1 - fraction))
+    train_end_day = valid_start_day - embargo
+    if train_end_day <= 0:
+        raise ValueError("Not enough history for a validation fold.")
+    positions = np.searchsorted(dates, unique_dates[[train_end_day, valid_start_day]], side='left')
+    return int(positions[0]), int(positions[1])
+
+def load_tuned_config(version: str = DEFAULT_MODEL_VERSION) -> dict:
+    """
+    Returns the best configuration found by tune_model for a model version, or {} if it was never tuned.
+
+    Returns:
+        dict: {'params': XGBoost parameters, 'num_boost_round': boosting rounds of the best trial, ...}
+    """
+    params_path = get_params_path(version)
+    if not params_path.exists():
+        return {}
+    with open(params_path) as f:
+        return json.load(f)
+
+@instrument()
+def tune_model(tickers: list, n_trials: int = DEFAULT_TRIALS, workers: int = None, seed: int = 0,
+               model_version: str = DEFAULT_MODEL_VERSION) -> dict:
+    """
+    Searches the XGBoost parameters with successive halving over random configurations.
+
+    Every trial of a rung trains in parallel on a process pool with early stopping on a
+    time-ordered validation fold. Only the best 1/HALVING_RATE of each rung get the next,
+    larger budget; trials that already stopped early keep their score instead of retraining.
+    Every result is written to the tuning_trials table in REPORTS_DIR, and the best
+    configuration is saved next to the model for the trainers to pick up.
+
+    Args:
+        tickers (list): The tickers whose master datasets form the panel.
+        n_trials (int): Random configurations in the first rung.
+        workers (int): Processes running trials in parallel. Defaults to the CPU count.
+        seed (int): Seed of the random search.
+        model_version (str): The model version the best parameters are saved for.
+
+    Returns:
+        dict: The best trial's parameters, budget and validation metrics.
+    """
+    start = time.perf_counter()
+    panel_df = load_training_panel(tickers)
+    train_end, valid_start = split_validation(panel_df['date'].to_numpy())
+    X = panel_df[MODEL_FEATURES].to_numpy(dtype=np.float32)
+    y = panel_df['target'].to_numpy(dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    candidates = {trial_id: sample_params(rng) for trial_id in range(n_trials)}
+    cpu_count = os.cpu_count() or 1
+    workers = workers or min(n_trials, cpu_count)
+    nthread = max(1, cpu_count // workers)
+    print(f"Tuning {n_trials} configurations on {train_end:,} training rows with {workers} processes "
+          f"({nthread} threads each)...")
+
+    all_results, latest = [], {}
+    survivors = list(candidates)
+    initargs = (X[:train_end], y[:train_end], X[valid_start:], y[valid_start:], nthread)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        for rung, budget in enumerate(RUNG_BUDGETS):
+            pending = [trial_id for trial_id in survivors if not latest.get(trial_id, {}).get('converged')]
+            futures = [executor.submit(_run_trial, trial_id, candidates[trial_id], budget) for trial_id in pending]
+            for future in futures:
+                result = dict(future.result(), rung=rung)
+                latest[result['trial']] = result
+                all_results.append(result)
+
+            survivors.sort(key=lambda trial_id: latest[trial_id]['valid_logloss'])
+            best = latest[survivors[0]]
+            print(f"Rung {rung} ({budget} rounds): trained {len(pending)}, "
+                  f"best logloss {best['valid_logloss']:.4f} (trial {best['trial']})")
+            if rung < len(RUNG_BUDGETS) - 1:
+                survivors = survivors[:max(1, len(survivors) // HALVING_RATE)]
+
+    trials_df = pd.DataFrame(all_results)
+    trials_df = trials_df.join(pd.DataFrame.from_dict(candidates, orient='index'), on='trial')
+    write_frame(trials_df, dataset_path(REPORTS_DIR, "tuning_trials"))
+
+    best = latest[survivors[0]]
+    summary = {
+        'params': candidates[best['trial']],
+        'num_boost_round': best['best_iteration'] + 1,
+        'valid_logloss': best['valid_logloss'],
+        'valid_accuracy': best['valid_accuracy'],
+        'trial': best['trial'],
+        'trials_run': len(all_results),
+        'seconds': time.perf_counter() - start,
+    }
+    params_path = get_params_path(model_version)
+    write_json(summary, params_path, indent=2)
+    print(f"✅ Best of {len(all_results)} trial runs: logloss {best['valid_logloss']:.4f}, "
+          f"accuracy {best['valid_accuracy']:.2%} ({summary['seconds']:.1f}s)")
+    print(f"Best parameters saved to {params_path}")
+    return summary
+
+if __name__ == '__main__':
+    tune_model(sys.argv[1:] or ["AAPL"])
@@ -0,0 +1,191 @@
+# backend/ml_models/walk_forward.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, write_frame
+from backend.utils.instrumentation import instrument
+from backend.feature_engineering.unify_features import TARGET_HORIZON, read_master_panel
+from backend.ml_models.feature_schema import MODEL_FEATURES
+
+DEFAULT_FOLDS = 5
+NUM_BOOST_ROUNDS = 200
+# Trees added per fold when each fold continues from the previous fold's booster
+WARM_START_ROUNDS = 50
+
+BASE_PARAMS = {
+    'objective': 'binary:logistic',
+    'eval_metric': 'logloss',
+    'tree_method': 'hist',
+}
+
+# Set once per worker process by _init_worker: the full panel as one DMatrix plus its labels
+_shared = {}
+
+def _init_worker(X: np.ndarray, y: np.ndarray, nthread: int):
+    """
+    Builds the panel DMatrix once per process. Folds then take row slices of it, so the
+    feature matrix is never re-converted from pandas per fold.
+    """
+    import xgboost as xgb
+    _shared['dmatrix'] = xgb.DMatrix(X, label=y, feature_names=MODEL_FEATURES, nthread=nthread)
+    _shared['y'] = y
+    _shared['nthread'] = nthread
+
+def make_folds(dates: np.ndarray, n_folds: int = DEFAULT_FOLDS, embargo: int = TARGET_HORIZON) -> list:
+    """
+    Splits date-sorted rows into expanding-window folds.
+
+    The trading days are cut into n_folds + 1 blocks. Fold k tests on block k + 1 and trains on
+    every row before it, except the last `embargo` days: their targets look into the test block.
+
+    Args:
+        dates (np.ndarray): The row dates, sorted ascending.
+
+    Returns:
+        list: One {'fold', 'train_end', 'test_start', 'test_end'} dict of row positions per fold.
+    """
+    unique_dates = np.unique(dates)
+    boundaries = np.linspace(0, len(unique_dates), n_folds + 2).astype(int)
+
+    folds = []
+    for k in range(n_folds):
+        test_start_day, test_end_day = boundaries[k + 1], boundaries[k + 2]
+        train_end_day = test_start_day - embargo
+        if train_end_day <= 0 or test_end_day <= test_start_day:
+            continue
+        positions = np.searchsorted(dates, unique_dates[[train_end_day, test_start_day]], side='left')
+        test_end = len(dates) if test_end_day >= len(unique_dates) else \
+            int(np.searchsorted(dates, unique_dates[test_end_day], side='left'))
+        folds.append({'fold': k, 'train_end': int(positions[0]), 'test_start': int(positions[1]), 'test_end': test_end})
+    return folds
+
+def _fit_fold(fold: dict, params: dict, num_rounds: int, xgb_model=None) -> dict:
+    """
+    Trains one fold on a slice of the shared DMatrix and scores its test block.
+    """
+    import xgboost as xgb
+    start = time.perf_counter()
+    dmatrix, y = _shared['dmatrix'], _shared['y']
+
+    train_rows = np.arange(fold['train_end'])
+    test_rows = np.arange(fold['test_start'], fold['test_end'])
+    y_train, y_test = y[train_rows], y[test_rows]
+
+    positives = np.sum(y_train == 1)
+    fold_params = dict(params, nthread=_shared['nthread'],
+                       scale_pos_weight=np.sum(y_train == 0) / positives if positives else 1)
+
+    booster = xgb.train(fold_params, dmatrix.slice(train_rows), num_boost_round=num_rounds, xgb_model=xgb_model)
+    probabilities = booster.predict(dmatrix.slice(test_rows))
+
+    clipped = np.clip(probabilities, 1e-7, 1 - 1e-7)
+    metrics = {
+        'fold': fold['fold'],
+        'train_rows': len(train_rows),
+        'test_rows': len(test_rows),
+        'accuracy': float(np.mean((probabilities > 0.5) == y_test)),
+        'logloss': float(-np.mean(y_test * np.log(clipped) + (1 - y_test) * np.log(1 - clipped))),
+        'auc': None,
+        'seconds': time.perf_counter() - start,
+    }
+    if len(np.unique(y_test)) == 2:
+        from sklearn.metrics import roc_auc_score
+        metrics['auc'] = float(roc_auc_score(y_test, probabilities))
+    return {'metrics': metrics, 'probabilities': probabilities,
+            'booster': bytes(booster.save_raw(raw_format='ubj'))}
+
+def load_training_panel(tickers: list) -> pd.DataFrame:
+    """
+    Loads the tickers' master datasets as one panel of complete feature rows, sorted by date.
+    """
+    panel_df = read_master_panel(tickers, columns=['date'] + MODEL_FEATURES + ['target'])
+    if panel_df.empty:
+        raise FileNotFoundError(f"No master datasets found for {tickers}.")
+    panel_df = panel_df.dropna(subset=MODEL_FEATURES)
+    # One global time order, so every fold's training rows precede its test rows
+    return panel_df.sort_values(['date', 'ticker'], kind='stable').reset_index(drop=True)
+
+@instrument()
+def run_walk_forward(tickers: list, n_folds: int = DEFAULT_FOLDS, workers: int = None, warm_start: bool = False,
+                     params: dict = None) -> dict:
+    """
+    Evaluates the model with expanding-window walk-forward folds over the tickers' master datasets,
+    and writes each ticker's out-of-sample predictions to historical_predictions_{ticker}.
+
+    Args:
+        tickers (list): The tickers whose master datasets form the panel.
+        n_folds (int): Number of walk-forward folds.
+        workers (int): Processes training folds in parallel. Defaults to min(n_folds, CPU count).
+        warm_start (bool): Train folds in order, each continuing from the previous fold's booster
+                           with WARM_START_ROUNDS extra trees instead of starting from scratch.
+                           The folds then depend on each other and run one at a time.
+        params (dict): XGBoost parameters overriding BASE_PARAMS.
+
+    Returns:
+        dict: {'folds': per-fold metrics, 'total_seconds': ..., 'oos_rows': ...}
+    """
+    start = time.perf_counter()
+    panel_df = load_training_panel(tickers)
+    X = panel_df[MODEL_FEATURES].to_numpy(dtype=np.float32)
+    y = panel_df['target'].to_numpy(dtype=np.float32)
+    folds = make_folds(panel_df['date'].to_numpy(), n_folds)
+    if not folds:
+        raise ValueError("Not enough history for walk-forward folds.")
+
+    params = dict(BASE_PARAMS, **(params or {}))
+    cpu_count = os.cpu_count() or 1
+    results = []
+
+    if warm_start:
+        print(f"Training {len(folds)} warm-started folds in order...")
+        _init_worker(X, y, cpu_count)
+        previous_booster = None
+        for fold in folds:
+            num_rounds = NUM_BOOST_ROUNDS if previous_booster is None else WARM_START_ROUNDS
+            result = _fit_fold(fold, params, num_rounds, xgb_model=previous_booster)
+            previous_booster = bytearray(result['booster'])
+            results.append(result)
+    else:
+        workers = workers or min(len(folds), cpu_count)
+        # Split the cores between the workers so they don't oversubscribe the machine
+        nthread = max(1, cpu_count // workers)
+        print(f"Training {len(folds)} folds on {workers} processes ({nthread} threads each)...")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, y, nthread)) as executor:
+            futures = [executor.submit(_fit_fold, fold, params, NUM_BOOST_ROUNDS) for fold in folds]
+            results = [future.result() for future in futures]
+
+    # --- Out-of-sample predictions, one file per ticker ---
+    oos_frames = []
+    for fold, result in zip(folds, results):
+        fold_df = panel_df.iloc[fold['test_start']:fold['test_end']][['date', 'ticker']].copy()
+        fold_df['probability'] = result['probabilities']
+        fold_df['prediction'] = (fold_df['probability'] > 0.5).astype(int)
+        oos_frames.append(fold_df)
+    oos_df = pd.concat(oos_frames, ignore_index=True)
+    for ticker, ticker_df in oos_df.groupby('ticker'):
+        write_frame(ticker_df[['date', 'prediction', 'probability']].reset_index(drop=True),
+                    dataset_path(PROCESSED_DATA_DIR, f"historical_predictions_{ticker}"))
+
+    fold_metrics = [result['metrics'] for result in results]
+    report = {'folds': fold_metrics, 'total_seconds': time.perf_counter() - start, 'oos_rows': len(oos_df)}
+
+    print("\n--- Walk-forward results ---")
+    for metrics in fold_metrics:
+        auc = f"{metrics['auc']:.3f}" if metrics['auc'] is not None else "  n/a"
+        print(f"Fold {metrics['fold']}: train {metrics['train_rows']:>8,} test {metrics['test_rows']:>7,} | "
+              f"acc {metrics['accuracy']:.2%} logloss {metrics['logloss']:.4f} auc {auc} | {metrics['seconds']:.1f}s")
+    print(f"✅ {len(fold_metrics)} folds in {report['total_seconds']:.1f}s, "
+          f"out-of-sample predictions saved for {oos_df['ticker'].nunique()} tickers.")
+    return report
+
+if __name__ == '__main__':
+    ticker_args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    run_walk_forward(ticker_args or ["AAPL"], warm_start="--warm-start" in sys.argv)
@@ -0,0 +1,40 @@
+# backend/tests/test_incremental_indicators.py
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+pytest.importorskip("pandas_ta")
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.feature_engineering.incremental_indicators import (
+    INDICATOR_COLUMNS, ROLLING_WINDOW, compute_indicators, make_synthetic_prices, update_indicators,
+    verify_against_pandas_ta, _state_from_json, _state_to_json
+)
+
+@pytest.mark.parametrize("split_at", [1, ROLLING_WINDOW - 1, ROLLING_WINDOW + 5, 1480])
+def test_incremental_update_matches_full_pandas_ta_recompute(split_at):
+    differences = verify_against_pandas_ta(make_synthetic_prices(), split_at=split_at)
+    assert set(differences) == set(INDICATOR_COLUMNS)
+
+def test_state_survives_json_round_trip():
+    prices = make_synthetic_prices(n_bars=400)
+    _, state = compute_indicators(prices.iloc[:300])
+    restored = _state_from_json(json.loads(json.dumps(_state_to_json(state))))
+
+    expected = update_indicators(state, prices.iloc[300:])
+    actual = update_indicators(restored, prices.iloc[300:])
+    assert expected.equals(actual)
+
+def test_previous_state_recomputes_a_replaced_last_bar():
+    prices = make_synthetic_prices(n_bars=400)
+    intraday = prices.iloc[:300].copy()
+    intraday.loc[299, ['high', 'low', 'close']] *= [1.03, 0.99, 1.02]
+    _, state = compute_indicators(intraday)
+    restored = _state_from_json(json.loads(json.dumps(_state_to_json(state))))
+
+    # Roll back to before the intraday bar and replay it with its final values
+    actual = update_indicators(restored['previous'], prices.iloc[299:])
+    expected, _ = compute_indicators(prices)
+    assert expected.iloc[299:].equals(actual)
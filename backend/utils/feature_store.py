@@ -0,0 +1,115 @@
+# backend/utils/feature_store.py
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame
+from backend.utils.instrumentation import add_counts
+
+# How many tickers keep their latest row and date index in memory at once.
+MAX_CACHED_TICKERS = 256
+
+# ticker -> {'path', 'mtime', 'dates', 'latest'}, ordered from least to most recently used
+_cache = OrderedDict()
+_cache_lock = threading.RLock()
+
+
+def get_master_path(ticker: str) -> Path:
+    """
+    Returns the path of a ticker's master dataset.
+    """
+    return dataset_path(PROCESSED_DATA_DIR, f"master_dataset_{ticker}")
+
+
+def _read_row(path: Path, date) -> pd.DataFrame:
+    # With parquet, only the row group holding this date is decoded
+    return read_frame(path, filters=[('date', '==', pd.Timestamp(date))]).tail(1)
+
+
+def _load_entry(ticker: str):
+    """
+    Builds the date index of a ticker's master dataset and loads its latest row.
+    """
+    path = get_master_path(ticker)
+    if not path.exists():
+        raise FileNotFoundError(f"Master dataset for {ticker} not found at {path}")
+
+    mtime = path.stat().st_mtime_ns
+    dates = np.sort(read_frame(path, columns=['date'])['date'].dropna().to_numpy(dtype='datetime64[ns]'))
+    latest = _read_row(path, dates[-1]) if len(dates) else pd.DataFrame()
+    return {'path': path, 'mtime': mtime, 'dates': dates, 'latest': latest}
+
+
+def _get_entry(ticker: str):
+    """
+    Returns the cached entry for a ticker, rebuilding it if the dataset changed on disk.
+    """
+    with _cache_lock:
+        entry = _cache.get(ticker)
+
+        # A rewrite of the dataset (by this or another process) makes the entry stale
+        if entry is not None:
+            try:
+                current_mtime = entry['path'].stat().st_mtime_ns
+            except FileNotFoundError:
+                current_mtime = None
+            if current_mtime != entry['mtime']:
+                entry = None
+
+        if entry is None:
+            add_counts(cache_misses=1)
+            entry = _load_entry(ticker)
+            _cache[ticker] = entry
+        else:
+            add_counts(cache_hits=1)
+
+        _cache.move_to_end(ticker)
+        while len(_cache) > MAX_CACHED_TICKERS:
+            _cache.popitem(last=False)
+        return entry
+
+
+def get_latest(ticker: str) -> pd.DataFrame:
+    """
+    Returns the latest master row for a ticker as a one-row DataFrame.
+
+    Served from memory after the first call, so its cost doesn't grow with the length of the history.
+    """
+    return _get_entry(ticker)['latest'].copy()
+
+
+def get_as_of(ticker: str, date) -> pd.DataFrame:
+    """
+    Returns the master row a model would have seen on a given date: the last row on or before it.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        date: Any value pd.Timestamp accepts.
+
+    Returns:
+        pd.DataFrame: A one-row DataFrame, or an empty one if the history starts after the date.
+    """
+    entry = _get_entry(ticker)
+    position = np.searchsorted(entry['dates'], np.datetime64(pd.Timestamp(date), 'ns'), side='right') - 1
+    if position < 0:
+        return entry['latest'].iloc[:0].copy()
+    if position == len(entry['dates']) - 1:
+        return entry['latest'].copy()
+    return _read_row(entry['path'], entry['dates'][position])
+
+
+def invalidate(ticker: str = None):
+    """
+    Drops the cached entry for a ticker (or every ticker), e.g. right after its dataset is rewritten.
+    """
+    with _cache_lock:
+        if ticker is None:
+            _cache.clear()
+        else:
+            _cache.pop(ticker, None)
@@ -0,0 +1,259 @@
+# backend/utils/instrumentation.py
+import contextvars
+import csv
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import REPORTS_DIR, INSTRUMENTATION_ENABLED, PROFILE_STAGE, REQUEST_RUN_REPORTS
+
+# Every finished stage of a run is appended to that run's log as one JSON line. Appending keeps
+# records from worker processes (the concurrent pipeline) in the same place.
+STAGE_LOGS_DIR = REPORTS_DIR / "stage_logs"
+PROFILES_DIR = REPORTS_DIR / "profiles"
+
+# Records are grouped into runs through an environment variable, so child processes inherit it.
+# Stages only record while a run is active, so serving calls outside a run cost nothing.
+RUN_ID_ENV = "STAGE_RUN_ID"
+
+REPORT_FIELDS = [
+    'run_id', 'stage', 'ticker', 'parent', 'status', 'started_at', 'wall_s', 'cpu_s',
+    'peak_rss_delta_mb', 'rows_in', 'rows_out', 'bytes_read', 'bytes_written', 'cache_hits', 'cache_misses', 'pid'
+]
+
+# The stages currently open in this thread or task, innermost last
+_active_stages = contextvars.ContextVar('active_stages', default=())
+# The run opened by recorded_run in this thread or task. Unlike the environment variable it isn't
+# shared with other threads, so concurrent requests in one process each get their own run.
+_active_run = contextvars.ContextVar('active_run', default=None)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def add_counts(**counts):
+    """
+    Adds counters to every open stage, e.g. add_counts(rows_in=100, bytes_read=4096) from the
+    storage layer or add_counts(cache_hits=3, cache_misses=1) from a cache.
+    """
+    for record in _active_stages.get():
+        for key, value in counts.items():
+            record[key] = record.get(key, 0) + value
+
+
+def current_run_id():
+    """
+    Returns the ID of the run stages are recorded into right now, or None outside a run.
+    """
+    return _active_run.get() or os.environ.get(RUN_ID_ENV)
+
+
+def _stage_log_path(run_id: str) -> Path:
+    return STAGE_LOGS_DIR / f"{run_id}.jsonl"
+
+
+def _append_to_log(record: dict):
+    log_path = _stage_log_path(record['run_id'])
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    # One short write per record, so concurrent appends from several processes don't interleave
+    with open(log_path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+@contextmanager
+def stage(name: str, ticker: str = None):
+    """
+    Measures a block as a pipeline stage and appends the result to the active run's stage log.
+    Outside a run (see start_run and recorded_run) the block runs unmeasured.
+
+    Yields the record being filled in, so a block that doesn't go through the storage layer can
+    set 'rows_in'/'rows_out' itself. Rows and bytes read or written inside the block (including
+    in nested stages) are counted automatically.
+
+    Args:
+        name (str): The stage name, e.g. 'unify_features'.
+        ticker (str): The ticker the stage works on, if any.
+    """
+    run_id = current_run_id()
+    if not INSTRUMENTATION_ENABLED or run_id is None:
+        yield {}
+        return
+
+    parents = _active_stages.get()
+    record = {
+        'run_id': run_id, 'stage': name, 'ticker': ticker,
+        'parent': parents[-1]['stage'] if parents else None, 'status': 'ok',
+        'started_at': time.time(), 'rows_in': 0, 'rows_out': 0, 'bytes_read': 0, 'bytes_written': 0,
+        'pid': os.getpid()
+    }
+    token = _active_stages.set(parents + (record,))
+
+    profiler = None
+    if PROFILE_STAGE == name:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    rss_before = _peak_rss_mb()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+    except BaseException:
+        record['status'] = 'failed'
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        record['wall_s'] = time.perf_counter() - wall_start
+        # Process-wide CPU time: in a threaded run it includes work done by other threads meanwhile
+        record['cpu_s'] = time.process_time() - cpu_start
+        rss_after = _peak_rss_mb()
+        record['peak_rss_delta_mb'] = rss_after - rss_before if rss_before is not None else None
+        _active_stages.reset(token)
+
+        if profiler is not None:
+            PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+            profile_path = PROFILES_DIR / f"{record['run_id']}_{name}_{ticker or 'all'}_{os.getpid()}.prof"
+            profiler.dump_stats(profile_path)
+            print(f"Saved profile of {name} to {profile_path}")
+        _append_to_log(record)
+
+
+def instrument(name: str = None, ticker_arg: str = 'ticker'):
+    """
+    Decorator that runs a function as a stage (see `stage`).
+
+    Args:
+        name (str): The stage name. Defaults to the function name.
+        ticker_arg (str): The parameter holding the ticker, if the function has one.
+    """
+    def decorator(function):
+        stage_name = name or function.__name__
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            ticker = None
+            if ticker_arg in signature.parameters:
+                ticker = signature.bind_partial(*args, **kwargs).arguments.get(ticker_arg)
+
+            with stage(stage_name, ticker=ticker if isinstance(ticker, str) else None) as record:
+                result = function(*args, **kwargs)
+                # A stage that returns a frame without writing one still reports its output size
+                if record and not record['rows_out'] and hasattr(result, 'shape'):
+                    record['rows_out'] = len(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def _new_run_id(name: str) -> str:
+    # The random suffix keeps runs started in the same second by one process apart
+    return f"{name}_{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}_{uuid.uuid4().hex[:6]}"
+
+
+def start_run(name: str) -> str:
+    """
+    Starts a new run: stages recorded from now on (here and in child processes) carry its ID.
+    """
+    run_id = _new_run_id(name)
+    os.environ[RUN_ID_ENV] = run_id
+    return run_id
+
+
+def end_run():
+    """
+    Ends the active run: stages started afterwards in this process are no longer recorded.
+    """
+    os.environ.pop(RUN_ID_ENV, None)
+
+
+@contextmanager
+def recorded_run(name: str):
+    """
+    Records the stages of a block as a run of its own and writes the run's report when it ends.
+
+    Meant for request-sized work (a prediction, a background job) in long-lived processes: the run
+    is only visible to the current thread or task, and child processes don't join it. Inside an
+    already active run the block simply joins that run. Off when REQUEST_RUN_REPORTS is disabled.
+
+    Yields:
+        str: The ID of the run the block is recorded into, or None.
+    """
+    if not INSTRUMENTATION_ENABLED or not REQUEST_RUN_REPORTS or current_run_id() is not None:
+        yield current_run_id()
+        return
+
+    run_id = _new_run_id(name)
+    token = _active_run.set(run_id)
+    try:
+        yield run_id
+    finally:
+        _active_run.reset(token)
+        write_run_report(run_id)
+
+
+def load_records(run_id: str) -> list:
+    """
+    Reads one run's stage log.
+    """
+    log_path = _stage_log_path(run_id)
+    if not log_path.exists():
+        return []
+    records = []
+    with open(log_path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+    return records
+
+
+def write_run_report(run_id: str) -> dict:
+    """
+    Writes a run's stage records to REPORTS_DIR/{run_id}.json and .csv and prints a per-stage summary.
+
+    Returns:
+        dict: Maps each stage to its call count and total wall/CPU seconds.
+    """
+    records = load_records(run_id)
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(REPORTS_DIR / f"{run_id}.json", 'w') as f:
+        json.dump(records, f, indent=2)
+    with open(REPORTS_DIR / f"{run_id}.csv", 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+
+    summary = {}
+    for record in records:
+        totals = summary.setdefault(record['stage'], {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+        totals['calls'] += 1
+        totals['wall_s'] += record['wall_s']
+        totals['cpu_s'] += record['cpu_s']
+
+    print(f"\n--- Stage report for {run_id} ---")
+    for stage_name, totals in sorted(summary.items(), key=lambda item: item[1]['wall_s'], reverse=True):
+        print(f"{stage_name:<28} {totals['calls']:>5} calls {totals['wall_s']:>9.2f}s wall {totals['cpu_s']:>9.2f}s cpu")
+    print(f"Report saved to {REPORTS_DIR / run_id}.json/.csv")
+    return summary
@@ -0,0 +1,212 @@
+# backend/utils/job_queue.py
+import multiprocessing
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import CACHE_DIR, JOB_WORKERS, JOB_STALE_SECONDS, JOB_HEARTBEAT_SECONDS
+from backend.utils.feature_store import get_master_path
+from backend.utils.instrumentation import recorded_run, stage
+
+JOBS_PATH = CACHE_DIR / "jobs.sqlite"
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Queued jobs whose owner hasn't sent a heartbeat for this long will never be picked up
+ORPHAN_SECONDS = 4 * JOB_HEARTBEAT_SECONDS
+
+# Identifies this process as the owner of the jobs it queues on its worker pool
+OWNER_ID = uuid.uuid4().hex
+
+# The worker pool is started on the first submission, so importing this module stays cheap
+_executor = None
+_executor_lock = threading.Lock()
+_heartbeat_thread = None
+
+def _connect() -> sqlite3.Connection:
+    JOBS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit mode, transactions are opened explicitly where they're needed
+    conn = sqlite3.connect(JOBS_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        " id TEXT PRIMARY KEY, ticker TEXT NOT NULL, status TEXT NOT NULL, stage TEXT,"
+        " progress REAL NOT NULL DEFAULT 0, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+        " started_at REAL, owner TEXT, heartbeat_at REAL)"
+    )
+    # Tables created before these columns existed
+    existing_columns = {column[1] for column in conn.execute("PRAGMA table_info(jobs)")}
+    for name, column_type in (('started_at', 'REAL'), ('owner', 'TEXT'), ('heartbeat_at', 'REAL')):
+        if name not in existing_columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_ticker_status ON jobs (ticker, status)")
+    return conn
+
+def _update_job(job_id: str, **fields):
+    fields['updated_at'] = time.time()
+    assignments = ', '.join(f"{name} = ?" for name in fields)
+    with closing(_connect()) as conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id])
+
+def _heartbeat():
+    """
+    Keeps this process's queued jobs alive, so other processes don't take them for orphans.
+    """
+    while True:
+        try:
+            with closing(_connect()) as conn:
+                conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'queued'",
+                             (time.time(), OWNER_ID))
+        except sqlite3.Error as e:
+            print(f"⚠️ Job heartbeat failed. Error: {e}")
+        time.sleep(JOB_HEARTBEAT_SECONDS)
+
+def _fail_orphaned_jobs(conn: sqlite3.Connection, now: float):
+    """
+    Marks failed the queued jobs whose owning process stopped before a worker picked them up.
+    """
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?"
+        " WHERE status = 'queued' AND COALESCE(heartbeat_at, created_at) < ?",
+        ("The process that queued the job stopped before it could run.", now, now - ORPHAN_SECONDS)
+    )
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor, _heartbeat_thread
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked: the Streamlit server that submits jobs is multi-threaded
+            _executor = ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_heartbeat, name="job-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+        return _executor
+
+def _submit_to_pool(job_id: str, ticker: str):
+    """
+    Hands a job to the worker pool, replacing the pool once if it has broken (e.g. a worker was killed).
+    """
+    global _executor
+    executor = _get_executor()
+    try:
+        future = executor.submit(_run_job, job_id, ticker)
+    except (BrokenProcessPool, RuntimeError) as e:
+        print(f"⚠️ Job worker pool is unusable ({e}). Starting a new one...")
+        with _executor_lock:
+            if _executor is executor:
+                _executor = None
+        executor.shutdown(wait=False)
+        future = _get_executor().submit(_run_job, job_id, ticker)
+    future.add_done_callback(lambda done: _on_job_finished(job_id, done))
+
+def _on_job_finished(job_id: str, future):
+    # _run_job records its own failures; an exception here means the worker itself died
+    error = None if future.cancelled() else future.exception()
+    if error is not None:
+        _update_job(job_id, status='failed', error=f"The job worker stopped: {error}")
+
+def _run_job(job_id: str, ticker: str):
+    """
+    Worker-side body of a job: generates the ticker's dataset, reporting each stage to the jobs table.
+    Each job is recorded as its own run, with a stage timing report in REPORTS_DIR.
+    """
+    with recorded_run(f"job_{ticker}"), stage('analysis_job', ticker=ticker):
+        _run_job_stages(job_id, ticker)
+
+def _run_job_stages(job_id: str, ticker: str):
+    from backend.main_handler import ensure_master_dataset
+
+    _update_job(job_id, status='running', stage='starting', started_at=time.time())
+    try:
+        ensure_master_dataset(ticker, progress=lambda stage, fraction: _update_job(job_id, stage=stage, progress=fraction))
+        if not get_master_path(ticker).exists():
+            raise FileNotFoundError(f"Master dataset for {ticker} could not be created.")
+        _update_job(job_id, status='done', stage='done', progress=1.0)
+    except Exception as e:
+        print(f"❌ Job {job_id} for {ticker} failed. Error: {e}")
+        _update_job(job_id, status='failed', error=str(e))
+
+def submit_analysis(ticker: str) -> str:
+    """
+    Queues the on-demand dataset generation for a ticker and returns the job ID right away.
+
+    If a job for the ticker is already queued or running (submitted by any session or process),
+    its ID is returned instead of starting another one. Queued jobs left behind by a process that
+    has since stopped are marked failed first, so they can't hold the ticker. If the dataset
+    already exists, the job is recorded as done without touching the worker pool.
+    """
+    now = time.time()
+    with closing(_connect()) as conn:
+        # IMMEDIATE takes the write lock up front, so two submitters can't both miss the active job
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _fail_orphaned_jobs(conn, now)
+            # Queued jobs of a live owner are never stale, they're only waiting for a free worker
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE ticker = ? AND (status = 'queued' OR (status = 'running' AND started_at >= ?))"
+                " ORDER BY created_at DESC LIMIT 1",
+                (ticker, now - JOB_STALE_SECONDS)
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return row[0]
+
+            job_id = uuid.uuid4().hex
+            status = 'done' if get_master_path(ticker).exists() else 'queued'
+            conn.execute(
+                "INSERT INTO jobs (id, ticker, status, stage, progress, created_at, updated_at, owner, heartbeat_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, ticker, status, status, 1.0 if status == 'done' else 0.0, now, now, OWNER_ID, now)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    if status == 'queued':
+        try:
+            _submit_to_pool(job_id, ticker)
+        except Exception as e:
+            _update_job(job_id, status='failed', error=str(e))
+            raise
+    return job_id
+
+def get_job(job_id: str):
+    """
+    Returns a job's state as a dict (ticker, status, stage, progress, error, ...), or None if unknown.
+    A job still running JOB_STALE_SECONDS after it started, or still queued by a process that
+    stopped sending heartbeats, is returned as failed.
+    """
+    with closing(_connect()) as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+
+    job = dict(row)
+    now = time.time()
+    if job['status'] == 'running' and now - (job['started_at'] or job['updated_at']) > JOB_STALE_SECONDS:
+        job['status'] = 'failed'
+        job['error'] = "The job did not finish in time and was abandoned."
+    elif job['status'] == 'queued' and now - (job['heartbeat_at'] or job['created_at']) > ORPHAN_SECONDS:
+        job['status'] = 'failed'
+        job['error'] = "The process that queued the job stopped before it could run."
+    return job
+
+if __name__ == '__main__':
+    # Submit a job from the command line and follow its progress
+    ticker = sys.argv[1] if len(sys.argv) > 1 else "AAPL"
+    job_id = submit_analysis(ticker)
+    while True:
+        job = get_job(job_id)
+        print(f"{job['ticker']}: {job['status']} ({job['stage']}, {job['progress']:.0%})")
+        if job['status'] not in ACTIVE_STATUSES:
+            break
+        time.sleep(1)
@@ -0,0 +1,88 @@
+# backend/utils/locking.py
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+import sys
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import CACHE_DIR
+
+LOCK_DIR = CACHE_DIR / "locks"
+
+# key -> Future of the call currently running for that key in this process
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+@contextmanager
+def file_lock(name: str):
+    """
+    Holds an exclusive cross-process lock for the duration of the block.
+
+    Every process (e.g. each Streamlit worker) that asks for the same name waits its turn.
+    The lock is released automatically if the holder dies.
+
+    Args:
+        name (str): The lock name, e.g. 'ticker_AAPL'.
+    """
+    LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_DIR / f"{name}.lock", 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            # LK_LOCK only retries for ~10s, so keep trying until the lock is ours
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def single_flight(key: str, function, *args, **kwargs):
+    """
+    Runs function(*args, **kwargs) at most once at a time per key within this process.
+
+    The first caller for a key runs the function. Callers that arrive while it is running
+    don't start their own call: they wait for it and get the same result (or exception).
+
+    Returns:
+        The function's return value.
+    """
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _in_flight[key] = future
+
+    if not is_leader:
+        print(f"Waiting for the in-flight run of '{key}'...")
+        return future.result()
+
+    try:
+        result = function(*args, **kwargs)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
@@ -0,0 +1,162 @@
+# backend/utils/storage.py
+import json
+import operator
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from backend.config.settings import STORAGE_BACKEND
+from backend.utils.instrumentation import add_counts
+
+# Columns that hold timestamps. Typed formats keep them as datetimes, CSV needs them re-parsed.
+DATE_COLUMNS = ('date', 'fiscalDateEnding', 'published_at')
+
+# Comparison operators accepted in `filters`, using the same (column, op, value) form as pyarrow
+_FILTER_OPERATORS = {
+    '==': operator.eq,
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda series, values: series.isin(values),
+    'not in': lambda series, values: ~series.isin(values),
+}
+
+def _apply_filters(df: pd.DataFrame, filters) -> pd.DataFrame:
+    """
+    Applies (column, op, value) filters in memory, for formats without predicate pushdown.
+    """
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        mask &= _FILTER_OPERATORS[op](df[column], value)
+    return df[mask]
+
+def _columns_to_load(columns, filters):
+    """
+    Adds the filter columns to a projection so they can be filtered on after loading.
+    """
+    if columns is None:
+        return None
+    extra = [column for column, _, _ in (filters or []) if column not in columns]
+    return list(columns) + extra
+
+# --- CSV ---
+def _read_csv(path: Path, columns=None, filters=None) -> pd.DataFrame:
+    load_columns = _columns_to_load(columns, filters)
+    df = pd.read_csv(path, usecols=load_columns)
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+    df = _apply_filters(df, filters)
+    return df[list(columns)] if columns is not None else df
+
+def _write_csv(df: pd.DataFrame, path: Path):
+    df.to_csv(path, index=False)
+
+# --- Parquet ---
+def _read_parquet(path: Path, columns=None, filters=None) -> pd.DataFrame:
+    # pyarrow only reads the requested columns and skips row groups that can't match the filters
+    return pd.read_parquet(path, columns=list(columns) if columns is not None else None, filters=filters or None)
+
+def _write_parquet(df: pd.DataFrame, path: Path):
+    df.to_parquet(path, index=False)
+
+# --- Feather (Arrow IPC) ---
+def _read_feather(path: Path, columns=None, filters=None) -> pd.DataFrame:
+    df = pd.read_feather(path, columns=_columns_to_load(columns, filters))
+    df = _apply_filters(df, filters)
+    return df[list(columns)] if columns is not None else df
+
+def _write_feather(df: pd.DataFrame, path: Path):
+    df.reset_index(drop=True).to_feather(path)
+
+BACKENDS = {
+    'csv': {'suffix': '.csv', 'read': _read_csv, 'write': _write_csv},
+    'parquet': {'suffix': '.parquet', 'read': _read_parquet, 'write': _write_parquet},
+    'feather': {'suffix': '.feather', 'read': _read_feather, 'write': _write_feather},
+}
+_SUFFIX_TO_BACKEND = {backend['suffix']: name for name, backend in BACKENDS.items()}
+
+def _backend_for_path(path: Path) -> dict:
+    """
+    Picks the backend that matches a file's extension.
+    """
+    try:
+        return BACKENDS[_SUFFIX_TO_BACKEND[Path(path).suffix]]
+    except KeyError:
+        raise ValueError(f"Unsupported storage format for {path}. Expected one of {list(_SUFFIX_TO_BACKEND)}.")
+
+def dataset_path(directory: Path, name: str, backend: str = None) -> Path:
+    """
+    Builds the file path of a dataset in the configured storage format.
+
+    Args:
+        directory (Path): The data directory (e.g. RAW_DATA_DIR).
+        name (str): The dataset name without extension (e.g. 'price_AAPL').
+        backend (str): Overrides the STORAGE_BACKEND setting.
+    """
+    backend = backend or STORAGE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}'. Expected one of {list(BACKENDS)}.")
+    return Path(directory) / f"{name}{BACKENDS[backend]['suffix']}"
+
+def read_frame(path: Path, columns: list = None, filters: list = None) -> pd.DataFrame:
+    """
+    Reads a dataset, keeping its column types.
+
+    Args:
+        path (Path): The dataset file. The format is picked from its extension.
+        columns (list): Only load these columns.
+        filters (list): Only load rows matching every (column, op, value) tuple,
+                        e.g. [('date', '>=', pd.Timestamp('2024-01-01'))].
+    """
+    path = Path(path)
+    df = _backend_for_path(path)['read'](path, columns=columns, filters=filters)
+    # The file size is an upper bound on what was read when columns or rows are skipped
+    add_counts(rows_in=len(df), bytes_read=path.stat().st_size)
+    return df
+
+@contextmanager
+def atomic_output(path: Path):
+    """
+    Yields a temporary path next to `path` and renames it over `path` once the block succeeds.
+
+    Readers see either the old file or the new one, never a partial write, and concurrent
+    writers can't interleave their output. The temporary path keeps the target's extension,
+    for writers that pick their format from it.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp{path.suffix}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def write_frame(df: pd.DataFrame, path: Path):
+    """
+    Writes a dataset in the format matching the path's extension, creating its directory if needed.
+    The write is atomic (see atomic_output).
+    """
+    with atomic_output(path) as tmp_path:
+        _backend_for_path(path)['write'](df, tmp_path)
+    add_counts(rows_out=len(df), bytes_written=Path(path).stat().st_size)
+
+def write_json(data, path: Path, **dump_kwargs):
+    """
+    Atomically writes a small JSON document, such as a state or metadata file.
+    """
+    with atomic_output(path) as tmp_path:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, **dump_kwargs)
@@ -1,11 +1,13 @@
 import streamlit as st
 import sys
+import time
 from pathlib import Path
 
 # Add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from backend.main_handler import get_prediction_for_ticker
+from backend.utils.job_queue import submit_analysis, get_job, ACTIVE_STATUSES
 from ui_components.display_info import display_prediction_and_drivers
 from backend.trading_logic.generate_recommendation import get_trade_recommendation
 from ui_components.dashboard_plots import (
@@ -13,6 +15,9 @@ from ui_components.dashboard_plots import (
     plot_performance_with_matplotlib
 )
 
+# How often the page checks on a running data-generation job
+JOB_POLL_SECONDS = 1.0
+
 # --- Page Configuration and Authentication ---
 st.set_page_config(page_title="Analysis Dashboard", layout="wide")
 
@@ -34,7 +39,25 @@ if analyze_button:
     if not ticker_input:
         st.warning("Please enter a stock ticker.")
     else:
-        with st.spinner(f'Running full analysis for **{ticker_input}**...'):
+        # Data generation runs in a background worker, the page polls the job below
+        st.session_state['analysis_job'] = {'ticker': ticker_input, 'job_id': submit_analysis(ticker_input)}
+
+analysis_job = st.session_state.get('analysis_job')
+if analysis_job:
+    ticker_input = analysis_job['ticker']
+    job = get_job(analysis_job['job_id'])
+
+    if job is not None and job['status'] in ACTIVE_STATUSES:
+        stage = (job['stage'] or 'queued').replace('_', ' ')
+        st.progress(job['progress'], text=f"Preparing data for **{ticker_input}**: {stage}...")
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
+    if job is None or job['status'] == 'failed':
+        st.error(f"Could not prepare data for {ticker_input}: {job['error'] if job else 'the job was not found.'}")
+        st.info("Check the terminal for specific backend error messages.")
+    else:
+        with st.spinner(f'Running analysis for **{ticker_input}**...'):
             results = get_prediction_for_ticker(ticker_input)
 
         # --- Check if results are valid and contain required keys ---
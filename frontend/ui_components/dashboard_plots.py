@@ -3,14 +3,13 @@ import pandas as pd
 import numpy as np
 import sys
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 
 # Add project root to path (if needed)
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 # Import data directories
 from backend.config.settings import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from backend.utils.storage import dataset_path, read_frame
 
 # frontend/ui_components/dashboard_plots.py
 
@@ -22,13 +21,10 @@ def display_price_history_chart(ticker: str):
     """
     st.subheader(f"Recent Price History for {ticker}")
     
-    sys.path.append(str(Path(__file__).resolve().parents[2]))
-    from backend.config.settings import RAW_DATA_DIR
-    
-    price_path = RAW_DATA_DIR / f"price_{ticker}.csv"
+    price_path = dataset_path(RAW_DATA_DIR, f"price_{ticker}")
     if price_path.exists():
         try:
-            price_df = pd.read_csv(price_path, parse_dates=['date'])
+            price_df = read_frame(price_path, columns=['date', 'close'])
             
             # --- FIX: Ensure the 'close' column is a numeric type ---
             price_df['close'] = pd.to_numeric(price_df['close'], errors='coerce')
@@ -48,16 +44,20 @@ def plot_performance_with_matplotlib(ticker: str):
     """
     st.subheader("Historical Model Performance (Backtest)")
 
-    price_path = RAW_DATA_DIR / f"price_{ticker}.csv"
-    pred_path = PROCESSED_DATA_DIR / f"historical_predictions_{ticker}.csv"
+    # matplotlib is only needed for this chart, so don't pay for it when the page first loads
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
+    price_path = dataset_path(RAW_DATA_DIR, f"price_{ticker}")
+    pred_path = dataset_path(PROCESSED_DATA_DIR, f"historical_predictions_{ticker}")
 
     if not price_path.exists() or not pred_path.exists():
         st.warning("Historical performance data not available for this ticker yet.")
         return
 
     try:
-        price_df = pd.read_csv(price_path, parse_dates=['date'])
-        pred_df = pd.read_csv(pred_path, parse_dates=['date'])
+        price_df = read_frame(price_path, columns=['date', 'close', 'low'])
+        pred_df = read_frame(pred_path)
     except Exception as e:
         st.warning(f"Error loading data: {e}")
         return